@@ -44,10 +44,17 @@ create_database() {
 # Function to apply schema
 apply_schema() {
     echo "Applying database schema..."
-    PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -U $DB_USER -p $DB_PORT -d $DB_NAME -f "$PROJECT_ROOT/app/db/init.sql"
+    PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -U $DB_USER -p $DB_PORT -d $DB_NAME -v ON_ERROR_STOP=1 -f "$PROJECT_ROOT/src/db/init.sql"
     echo "Database schema applied successfully."
 }
 
+# Function to apply pending migrations and record them in schema_migrations
+apply_migrations() {
+    echo "Applying database migrations..."
+    (cd "$PROJECT_ROOT/src" && postgresql_dsn="postgresql://$DB_USER:$DB_PASSWORD@$DB_HOST:$DB_PORT/$DB_NAME" python -m db.migrate)
+    echo "Database migrations applied successfully."
+}
+
 # Main execution
 echo "Starting database setup..."
 
@@ -60,4 +67,7 @@ create_database
 # Apply schema
 apply_schema
 
+# Apply migrations
+apply_migrations
+
 echo "Database setup completed successfully!"
@@ -0,0 +1,125 @@
+import random
+from typing import Any, Dict, List, Optional
+
+HOME_TYPES = ("SINGLE_FAMILY", "CONDO", "TOWNHOUSE", "MULTI_FAMILY", "LOT")
+STATUS_TYPES = ("FOR_SALE", "FOR_RENT", "SOLD")
+CITIES = (
+    ("Los Angeles", "90012", 34.05, -118.24),
+    ("San Francisco", "94103", 37.77, -122.42),
+    ("San Diego", "92101", 32.72, -117.16),
+    ("Sacramento", "95814", 38.58, -121.49),
+    ("Fresno", "93721", 36.74, -119.78),
+)
+
+
+def make_listing(index: int, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """A synthetic list result with every field Parser reads.
+
+    Field placement varies the way real responses do, so the parser's
+    fallbacks (top-level vs ``hdpData.homeInfo``) are exercised.
+    """
+    rng = rng or random
+    city, zipcode, lat, lng = CITIES[index % len(CITIES)]
+    zpid = str(100000000 + index)
+    beds = rng.randint(1, 6)
+    baths = rng.randint(1, 4)
+    price = rng.randrange(150000, 3000000, 1000)
+    latitude = lat + rng.uniform(-0.2, 0.2)
+    longitude = lng + rng.uniform(-0.2, 0.2)
+    home_info = {
+        "zpid": int(zpid),
+        "streetAddress": f"{rng.randint(1, 9999)} Main St",
+        "zipcode": zipcode,
+        "city": city,
+        "state": "CA",
+        "latitude": latitude,
+        "longitude": longitude,
+        "price": float(price),
+        "bathrooms": float(baths),
+        "bedrooms": float(beds),
+        "livingArea": float(rng.randint(500, 6000)),
+        "homeType": HOME_TYPES[index % len(HOME_TYPES)],
+        "homeStatus": "FOR_SALE",
+    }
+    listing = {
+        "zpid": zpid,
+        "id": zpid,
+        "statusType": STATUS_TYPES[index % len(STATUS_TYPES)],
+        "unformattedPrice": price if index % 4 else f"${price:,}",
+        "price": f"${price:,}",
+        "address": f"{home_info['streetAddress']}, {city}, CA {zipcode}",
+        "detailUrl": f"https://www.zillow.com/homedetails/{zpid}_zpid/",
+        "brokerName": f"Broker {index % 50}",
+        "carouselPhotos": [
+            {"url": f"https://photos.zillowstatic.com/fp/{zpid}-{n}.jpg"}
+            for n in range(rng.randint(0, 8))
+        ],
+        "hdpData": {"homeInfo": home_info},
+    }
+    # Some listings only carry these under hdpData.homeInfo
+    if index % 3:
+        listing["beds"] = beds
+        listing["baths"] = baths
+        listing["zipcode"] = zipcode
+        listing["latLong"] = {"latitude": latitude, "longitude": longitude}
+    else:
+        home_info["beds"] = beds
+        home_info["baths"] = baths
+    return listing
+
+
+def make_listings(count: int, seed: int = 0, start: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_listing(start + i, rng) for i in range(count)]
+
+
+def make_map_result(index: int, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """A ``mapResults`` pin: a lighter listing the scraper never reads."""
+    rng = rng or random
+    city, zipcode, lat, lng = CITIES[index % len(CITIES)]
+    zpid = str(100000000 + index)
+    price = rng.randrange(150000, 3000000, 1000)
+    return {
+        "zpid": zpid,
+        "price": f"${price:,}",
+        "priceLabel": f"${price // 1000}K",
+        "beds": rng.randint(1, 6),
+        "baths": rng.randint(1, 4),
+        "statusType": STATUS_TYPES[index % len(STATUS_TYPES)],
+        "latLong": {
+            "latitude": lat + rng.uniform(-0.2, 0.2),
+            "longitude": lng + rng.uniform(-0.2, 0.2),
+        },
+        "imgSrc": f"https://photos.zillowstatic.com/fp/{zpid}-p_e.jpg",
+        "detailUrl": f"/homedetails/{zpid}_zpid/",
+        "hdpData": {"homeInfo": {"zpid": int(zpid), "city": city, "zipcode": zipcode}},
+        "isFavorite": False,
+    }
+
+
+def make_search_response(
+    listings: List[Dict[str, Any]],
+    total: Optional[int] = None,
+    map_results: int = 0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """An ``async-create-search-page-state`` response carrying ``listings``.
+
+    Real responses also carry many more ``mapResults`` pins than list
+    results, which is most of their size; ``map_results`` adds that many.
+    """
+    total = len(listings) if total is None else total
+    rng = random.Random(seed)
+    pins = [make_map_result(index, rng) for index in range(map_results)]
+    return {
+        "user": {"guid": "00000000-0000-0000-0000-000000000000", "isLoggedIn": False},
+        "cat1": {
+            "searchResults": {"listResults": listings, "mapResults": pins},
+            "searchList": {
+                "totalResultCount": total,
+                "totalPages": max(1, -(-total // max(1, len(listings)))),
+                "resultsPerPage": len(listings),
+            },
+        },
+        "categoryTotals": {"cat1": {"totalResultCount": total}},
+    }
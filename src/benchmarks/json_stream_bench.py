@@ -0,0 +1,84 @@
+"""Micro-benchmark: decoding a search response whole vs streaming listResults.
+
+The body is fed in socket-sized chunks. "whole" joins them and decodes the
+entire document, as ``response.json()`` does; "streaming" decodes only the
+listResults items as their chunks arrive. Peak memory is measured with
+tracemalloc over decoding one page and includes the buffered body.
+
+Run from src/: python -m benchmarks.json_stream_bench [--map-results N] [--repeat R]
+"""
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+
+from utils import json_stream
+from utils.json_stream import iter_items
+from benchmarks.fixtures import make_listings, make_search_response
+
+
+def whole(chunks, decode) -> list:
+    data = decode(b"".join(chunks))
+    return data.get("cat1", {}).get("searchResults", {}).get("listResults", [])
+
+
+def variants() -> dict:
+    result = {"whole, json": lambda chunks: whole(chunks, json.loads)}
+    if json_stream.JSON_BACKEND == "orjson":
+        result["whole, orjson"] = lambda chunks: whole(chunks, json_stream.loads)
+    result["streaming listResults"] = lambda chunks: list(iter_items(chunks))
+    return result
+
+
+def measure(func, chunks: list, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(iter(chunks))
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func(iter(chunks))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak": peak}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--listings", type=int, default=40)
+    arg_parser.add_argument("--map-results", type=int, default=500)
+    arg_parser.add_argument("--chunk-size", type=int, default=16 * 1024)
+    arg_parser.add_argument("--repeat", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    listings = make_listings(args.listings)
+    body = json.dumps(make_search_response(listings, map_results=args.map_results))
+    body = body.encode()
+    chunks = [
+        body[i : i + args.chunk_size] for i in range(0, len(body), args.chunk_size)
+    ]
+    expected = json.loads(body)["cat1"]["searchResults"]["listResults"]
+
+    print(
+        f"{args.listings} listings + {args.map_results} map results, "
+        f"{len(body) / 1024:.0f} KiB in {len(chunks)} chunks"
+    )
+    results = {}
+    for name, func in variants().items():
+        assert func(iter(chunks)) == expected, name
+        results[name] = measure(func, chunks, args.repeat)
+    baseline = results["whole, json"]
+    for name, result in results.items():
+        print(
+            f"{name:26s} {result['seconds'] * 1e3:7.2f} ms/page "
+            f"({baseline['seconds'] / result['seconds']:.1f}x)  "
+            f"peak {result['peak'] / 1024:7.0f} KiB "
+            f"({baseline['peak'] / result['peak']:.1f}x less)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark: listing parse throughput under each logging configuration.
+
+Parses fixture listings with Parser's row-by-row methods, which emit several
+per-listing and per-image log lines. Handlers write to a temp directory and
+os.devnull; ``--write-latency`` adds a sleep per console write to stand in
+for a slow terminal or log pipe. Queue modes are reported both on the
+parsing thread and until the listener has drained.
+
+Run from src/: python -m benchmarks.logging_bench [--listings N] [--write-latency US]
+"""
+import os
+import time
+import logging
+import argparse
+import tempfile
+
+from utils import logger as log_config
+from utils.parser import Parser
+from benchmarks.fixtures import make_listings
+
+# (name, queue, json, level, rate-limit item logs)
+SCENARIOS = (
+    ("sync, every item line (old behaviour)", False, False, logging.DEBUG, False),
+    ("queue, every item line", True, False, logging.DEBUG, False),
+    ("queue + json, every item line", True, True, logging.DEBUG, False),
+    ("queue, item lines rate-limited", True, False, logging.DEBUG, True),
+    ("sync, INFO (item lines disabled)", False, False, logging.INFO, True),
+)
+
+
+class SlowStream:
+    """File wrapper whose writes block for ``latency`` seconds."""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def parse_all(parser: Parser, listings: list) -> None:
+    for listing in listings:
+        house = parser.parse_house_data(listing)
+        parser.parse_address_data(listing, house[0])
+        parser.parse_image_data(listing, house[0])
+
+
+def run(listings: list, logs_dir: str, stream, use_queue, json_format, level, limited):
+    log_config.configure_logging(
+        use_queue=use_queue,
+        json_format=json_format,
+        level=level,
+        logs_dir=logs_dir,
+        stream=stream,
+    )
+    item_logger = logging.getLogger(log_config.ITEM_LOGGER)
+    filters = list(item_logger.filters)
+    if not limited:
+        for item_filter in filters:
+            item_logger.removeFilter(item_filter)
+    try:
+        parser = Parser()
+        start = time.perf_counter()
+        parse_all(parser, listings)
+        caller = time.perf_counter() - start
+        log_config.shutdown_logging()
+        drained = time.perf_counter() - start
+    finally:
+        for item_filter in filters:
+            item_logger.addFilter(item_filter)
+    return caller, drained
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--listings", type=int, default=5000)
+    arg_parser.add_argument(
+        "--write-latency", type=float, default=0, help="microseconds per write"
+    )
+    args = arg_parser.parse_args()
+
+    listings = make_listings(args.listings)
+    with tempfile.TemporaryDirectory() as logs_dir, open(os.devnull, "w") as devnull:
+        stream = devnull
+        if args.write_latency:
+            stream = SlowStream(devnull, args.write_latency / 1e6)
+        results = [
+            (name,) + run(listings, logs_dir, stream, *options)
+            for name, *options in SCENARIOS
+        ]
+        logging.getLogger().handlers.clear()
+
+    print(
+        f"{args.listings} listings, {args.write_latency:g}us per console write; "
+        "listings/s on the parsing thread (drained)"
+    )
+    for name, caller, drained in results:
+        print(
+            f"{name:40s} {args.listings / caller:10.0f} "
+            f"({args.listings / drained:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
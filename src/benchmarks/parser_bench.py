@@ -0,0 +1,59 @@
+"""Micro-benchmark: Parser.parse_listing vs the compiled ListingExtractor.
+
+Run from src/: python -m benchmarks.parser_bench [--listings N] [--repeat R]
+"""
+import time
+import logging
+import argparse
+
+from utils.parser import Parser
+from utils.extractor import ListingExtractor
+from benchmarks.fixtures import make_listings
+
+
+def bench(func, listings, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for listing in listings:
+            func(listing)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--listings", type=int, default=20000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    # Measure parsing, not the per-listing log lines
+    logging.disable(logging.CRITICAL)
+    listings = make_listings(args.listings)
+
+    parser = Parser()
+    extractor = ListingExtractor()
+    for listing in listings[:100]:
+        expected = parser.parse_listing(listing)
+        actual = extractor.parse_listing(listing)
+        # ids are random uuids; compare everything else
+        assert expected[0][1:] == actual[0][1:], (expected[0], actual[0])
+        assert expected[2][1:-1] == actual[2][1:-1], (expected[2], actual[2])
+        assert [i[2] for i in expected[3]] == [i[2] for i in actual[3]]
+
+    results = {
+        "Parser.parse_listing": bench(parser.parse_listing, listings, args.repeat),
+        "ListingExtractor.parse_listing": bench(
+            extractor.parse_listing, listings, args.repeat
+        ),
+    }
+    baseline = results["Parser.parse_listing"]
+    for name, seconds in results.items():
+        print(
+            f"{name:32s} {seconds:.3f}s  "
+            f"{args.listings / seconds:,.0f} listings/s  {baseline / seconds:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""End-to-end benchmark: ZillowScraper against the local stand-in server.
+
+Each scenario crawls fixture pages from benchmarks.standin_server into a
+throwaway Postgres (tables are truncated between scenarios, so never point
+this at real data) and reports pages/s, listings/s, p50/p99 latency per
+pipeline stage from the span trace, and peak RSS. Scenarios run in fresh
+processes so their peak RSS does not carry over. Results are written as
+JSON; pass an earlier file as ``--baseline`` to print the change.
+
+Run from src/: python -m benchmarks.pipeline_bench --dsn postgresql://... \
+    [--pages N] [--page-size N] [--scenario NAME] [--output results.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime, timezone
+
+from benchmarks.standin_server import StandInServer
+from typing import Any, Dict, List, Optional
+
+# name -> (scraper options, server settings)
+SCENARIOS: Dict[str, tuple] = {
+    "sequential": ({"mode": "scrape"}, {}),
+    "async-4": ({"mode": "async", "concurrency": 4}, {}),
+    "async-4-latency-50ms": (
+        {"mode": "async", "concurrency": 4},
+        {"latency": 0.05, "jitter": 0.02},
+    ),
+    "async-4-errors-5pct": (
+        {"mode": "async", "concurrency": 4},
+        {"error_rate": 0.05},
+    ),
+    "async-4-stream-json": (
+        {"mode": "async", "concurrency": 4, "stream_json": True},
+        {},
+    ),
+    "async-4-parse-pool": (
+        {"mode": "async", "concurrency": 4, "parse_workers": 2},
+        {},
+    ),
+    "async-4-upsert-history": (
+        {"mode": "async", "concurrency": 4, "upsert": True, "history": True},
+        {},
+    ),
+    # Crawls with the response archive on, then replays it into an empty database
+    "async-4-archive-replay": (
+        {"mode": "async", "concurrency": 4, "archive": True},
+        {},
+    ),
+}
+
+TABLES = ("images", "address", "house_history", "house", "broker", "crawl_checkpoint")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def stage_latencies(trace_path: str) -> Dict[str, Dict[str, float]]:
+    """p50/p99 seconds and count per stage from a SpanTracer file."""
+    durations: Dict[str, List[float]] = {}
+    with open(trace_path) as f:
+        for line in f:
+            span = json.loads(line)
+            durations.setdefault(span["name"], []).append(span["duration"])
+    return {
+        stage: {
+            "count": len(values),
+            "p50": percentile(values, 0.50),
+            "p99": percentile(values, 0.99),
+        }
+        for stage, values in sorted(durations.items())
+    }
+
+
+def reset_database() -> None:
+    from db.pool import get_pool
+    from db.migrate import MigrationRunner
+
+    pool = get_pool()
+    MigrationRunner(pool).migrate()
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE;")
+
+
+def run_scenario(name: str, url: str, pages: int, trace_path: str) -> Dict[str, Any]:
+    """Crawl ``pages`` pages in this (fresh) process and measure it."""
+    # Imported here: the scraper builds its pool from the DSN at import time
+    import zillow_scraper
+    from utils.archive import ResponseArchive
+    from utils.metrics import SpanTracer, get_metrics
+
+    options, _ = SCENARIOS[name]
+    options = dict(options)
+    mode = options.pop("mode")
+    concurrency = options.pop("concurrency", 1)
+    archive_dir = None
+    if options.pop("archive", False):
+        archive_dir = os.path.join(os.path.dirname(trace_path), f"{name}-archive")
+        options["archive"] = ResponseArchive(archive_dir)
+
+    reset_database()
+    metrics = get_metrics()
+    metrics.tracer = SpanTracer(trace_path)
+    scraper = zillow_scraper.ZillowScraper(url=url, rate=1000.0, **options)
+    start = time.perf_counter()
+    try:
+        if mode == "async":
+            scraper.scrape_async(pages, concurrency=concurrency)
+        else:
+            scraper.scrape(pages)
+    finally:
+        elapsed = time.perf_counter() - start
+        fetch_stats = scraper.fetch_stats()
+        scraper.close()
+        metrics.tracer.close()
+        metrics.tracer = None
+        if archive_dir is not None:
+            options["archive"].close()
+
+    with zillow_scraper.db_pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM house;")
+            houses = cur.fetchone()[0]
+
+    replay = None
+    if archive_dir is not None:
+        reset_database()
+        zillow_scraper.broker_repo.cache.clear()
+        replayer = zillow_scraper.ZillowScraper(url=url)
+        start = time.perf_counter()
+        counts = replayer.replay([archive_dir])
+        replay_seconds = time.perf_counter() - start
+        replayer.close()
+        replay = {
+            "seconds": replay_seconds,
+            "pages_per_s": counts["pages"] / replay_seconds,
+            "listings_per_s": counts["listings"] / replay_seconds,
+        }
+    zillow_scraper.db_pool.close()
+
+    stages = stage_latencies(trace_path)
+    fetched = stages.get("fetch", {}).get("count", 0)
+    return {
+        "seconds": elapsed,
+        "pages": fetched,
+        "listings": houses,
+        "pages_per_s": fetched / elapsed,
+        "listings_per_s": houses / elapsed,
+        "stages": stages,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "fetch": {k: v for k, v in fetch_stats.items() if isinstance(v, int)},
+        "replay": replay,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    previous = baseline["scenarios"] if baseline else {}
+    print(
+        f"{'scenario':26s} {'pages/s':>9s} {'listings/s':>11s} "
+        f"{'fetch p50/p99 ms':>17s} {'persist p50/p99 ms':>19s} {'RSS MiB':>8s}"
+    )
+    for name, result in results["scenarios"].items():
+        fetch = result["stages"].get("fetch", {})
+        persist = result["stages"].get("persist", {})
+        line = (
+            f"{name:26s} {result['pages_per_s']:9.1f} {result['listings_per_s']:11.0f} "
+            f"{fetch.get('p50', 0) * 1e3:8.1f}/{fetch.get('p99', 0) * 1e3:<8.1f} "
+            f"{persist.get('p50', 0) * 1e3:9.1f}/{persist.get('p99', 0) * 1e3:<9.1f} "
+            f"{result['peak_rss_mib']:8.0f}"
+        )
+        if name in previous:
+            change = result["listings_per_s"] / previous[name]["listings_per_s"] - 1
+            line += f"  {change * 100:+.1f}% listings/s"
+        print(line)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--dsn", default=os.getenv("BENCH_DSN"), help="throwaway database (BENCH_DSN)"
+    )
+    arg_parser.add_argument("--pages", type=int, default=25)
+    arg_parser.add_argument("--page-size", type=int, default=40)
+    arg_parser.add_argument(
+        "--map-results", type=int, default=250, help="map pins per page"
+    )
+    arg_parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable"
+    )
+    arg_parser.add_argument("--output", default="pipeline_bench.json")
+    arg_parser.add_argument("--baseline", help="earlier --output file to compare")
+    args = arg_parser.parse_args()
+    if not args.dsn:
+        arg_parser.error("--dsn or BENCH_DSN is required")
+
+    # Children read the DSN from the environment when the scraper is imported
+    os.environ["postgresql_dsn"] = args.dsn
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    context = multiprocessing.get_context("spawn")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pages": args.pages,
+            "page_size": args.page_size,
+            "map_results": args.map_results,
+        },
+        "scenarios": {},
+    }
+    with StandInServer(
+        pages=args.pages, page_size=args.page_size, map_results=args.map_results
+    ) as server:
+        with tempfile.TemporaryDirectory() as trace_dir:
+            for name in args.scenario or SCENARIOS:
+                _, settings = SCENARIOS[name]
+                server.latency = settings.get("latency", 0.0)
+                server.jitter = settings.get("jitter", 0.0)
+                server.error_rate = settings.get("error_rate", 0.0)
+                server.reset()
+                trace_path = os.path.join(trace_dir, f"{name}.jsonl")
+                with context.Pool(1) as pool:
+                    result = pool.apply(
+                        run_scenario, (name, server.url, args.pages, trace_path)
+                    )
+                result["server"] = dict(server.counts)
+                results["scenarios"][name] = result
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Micro-benchmark: RealDictCursor rows vs the compact db.rows types.
+
+Builds rows the way each cursor does from the tuples psycopg2 decodes and
+reports time and retained memory per million rows. Column values are shared
+between variants, so the memory figures are the per-row container overhead.
+
+Run from src/: python -m benchmarks.rows_bench [--rows N] [--repeat R]
+"""
+import gc
+import time
+import uuid
+import random
+import argparse
+import tracemalloc
+
+from psycopg2.extras import RealDictRow
+
+from db.rows import House
+
+COLUMNS = House._fields
+
+
+def make_tuples(count: int, seed: int = 7) -> list:
+    """House-shaped tuples as a plain cursor would return them."""
+    rng = random.Random(seed)
+    broker_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(50)]
+    return [
+        (
+            str(uuid.UUID(int=rng.getrandbits(128))),
+            str(100000000 + index),
+            float(rng.randrange(100000, 3000000, 1000)),
+            "FOR_SALE",
+            rng.randint(1, 6),
+            rng.randint(1, 4),
+            float(rng.randrange(500, 5000)),
+            "SINGLE_FAMILY",
+            f"https://www.zillow.com/homedetails/{100000000 + index}_zpid/",
+            rng.choice(broker_ids),
+        )
+        for index in range(count)
+    ]
+
+
+def dict_row(row: tuple) -> RealDictRow:
+    return RealDictRow(zip(COLUMNS, row))
+
+
+def measure(build, tuples: list, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        rows = [build(row) for row in tuples]
+        best = min(best, time.perf_counter() - start)
+        del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = [build(row) for row in tuples]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return {"seconds": best, "bytes": retained}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1000000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    tuples = make_tuples(args.rows)
+    assert dict(dict_row(tuples[0])) == House(*tuples[0])._asdict()
+
+    results = {
+        "RealDictRow": measure(dict_row, tuples, args.repeat),
+        "House namedtuple": measure(lambda row: House(*row), tuples, args.repeat),
+    }
+    scale = 1000000 / args.rows
+    baseline = results["RealDictRow"]
+    print(f"{args.rows} rows, figures per million rows")
+    for name, result in results.items():
+        print(
+            f"{name:22s} {result['seconds'] * scale:7.3f}s "
+            f"{result['bytes'] * scale / 2**20:8.1f} MiB "
+            f"({baseline['bytes'] / max(result['bytes'], 1):.1f}x less memory, "
+            f"{baseline['seconds'] / result['seconds']:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
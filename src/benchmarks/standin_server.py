@@ -0,0 +1,189 @@
+"""Local stand-in for Zillow's async-create-search-page-state endpoint.
+
+Answers every PUT with a synthetic search response for the requested
+``pagination.currentPage``: ``page_size`` listings (plus ``map_results``
+map pins) on pages 1..``pages`` and an empty list after that. Responses can
+be delayed (``latency`` plus up to ``jitter`` seconds), padded to a minimum
+size, and replaced by throttling or server errors at ``error_rate``. Bodies
+are generated once per page and cached, so the server is not what a
+benchmark measures.
+
+Run from src/: python -m benchmarks.standin_server [--port 8099] [--pages N]
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import make_listings, make_search_response
+from typing import Dict, Optional
+
+
+class StandInServer:
+    """Threaded HTTP server serving fixture pages from a daemon thread.
+
+    Settings are plain attributes and may be changed between runs; call
+    ``reset`` after changing ``page_size``, ``map_results``, ``pages`` or
+    ``pad_bytes``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        pages: int = 20,
+        page_size: int = 40,
+        map_results: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses=(503, 429),
+        pad_bytes: int = 0,
+        seed: int = 0,
+    ):
+        self.pages = pages
+        self.page_size = page_size
+        self.map_results = map_results
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.pad_bytes = pad_bytes
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies: Dict[int, bytes] = {}
+        self.counts = {"requests": 0, "errors": 0, "bytes": 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_PUT(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                status, body = server.respond(self.rfile.read(length))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_PUT
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/async-create-search-page-state"
+
+    def reset(self) -> None:
+        """Drop cached bodies and counters, and reseed the error injection."""
+        with self._lock:
+            self._bodies.clear()
+            self._rng = random.Random(self.seed)
+            self.counts = {"requests": 0, "errors": 0, "bytes": 0}
+
+    def page_body(self, page: int) -> bytes:
+        body = self._bodies.get(page)
+        if body is None:
+            listings, pins = [], 0
+            if 1 <= page <= self.pages:
+                listings = make_listings(
+                    self.page_size,
+                    seed=self.seed * 100003 + page,
+                    start=(page - 1) * self.page_size,
+                )
+                pins = self.map_results
+            response = make_search_response(
+                listings, self.pages * self.page_size, pins, seed=page
+            )
+            body = json.dumps(response).encode()
+            if len(body) < self.pad_bytes:
+                # JSON allows trailing whitespace, so the payload stays valid
+                body += b" " * (self.pad_bytes - len(body))
+            self._bodies[page] = body
+        return body
+
+    def respond(self, request_body: bytes):
+        """(status, body) for one request, after the configured delay."""
+        with self._lock:
+            self.counts["requests"] += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.counts["errors"] += 1
+                status = self._rng.choice(self.error_statuses)
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return status, b'{"error": "injected"}'
+        try:
+            payload = json.loads(request_body)
+            page = int(payload["searchQueryState"]["pagination"]["currentPage"])
+        except (ValueError, KeyError, TypeError):
+            return 400, b'{"error": "bad request"}'
+        with self._lock:
+            body = self.page_body(page)
+            self.counts["bytes"] += len(body)
+        return 200, body
+
+    def start(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> Optional[bool]:
+        self.stop()
+        return None
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--port", type=int, default=8099)
+    arg_parser.add_argument("--pages", type=int, default=20)
+    arg_parser.add_argument("--page-size", type=int, default=40)
+    arg_parser.add_argument("--map-results", type=int, default=0)
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    arg_parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--pad-bytes", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    server = StandInServer(
+        port=args.port,
+        pages=args.pages,
+        page_size=args.page_size,
+        map_results=args.map_results,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        pad_bytes=args.pad_bytes,
+    )
+    print(f"Serving on {server.url} (Ctrl-C to stop)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
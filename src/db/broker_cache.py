@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+
+from typing import Any, Dict, Iterable, Optional
+
+
+class BrokerCache:
+    """Size-capped LRU cache of broker name -> id.
+
+    An id -> name index lets renames and deletes (which are keyed by id)
+    evict the stale name entry.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._by_name: "OrderedDict[str, Any]" = OrderedDict()
+        self._by_id: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name: str) -> Optional[Any]:
+        """Broker id for ``name``, or None on a miss."""
+        with self._lock:
+            broker_id = self._by_name.get(name)
+            if broker_id is None:
+                self.misses += 1
+                return None
+            self._by_name.move_to_end(name)
+            self.hits += 1
+            return broker_id
+
+    def put(self, name: str, broker_id: Any) -> None:
+        with self._lock:
+            self._put(name, broker_id)
+
+    def update(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add ``{"id", "name"}`` rows, e.g. RETURNING results of an upsert."""
+        with self._lock:
+            for row in rows:
+                self._put(row["name"], row["id"])
+
+    def evict_id(self, broker_id: Any) -> None:
+        with self._lock:
+            name = self._by_id.pop(str(broker_id), None)
+            if name is not None:
+                self._by_name.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_name.clear()
+            self._by_id.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._by_name),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def _put(self, name: str, broker_id: Any) -> None:
+        key = str(broker_id)
+        # A renamed broker keeps its id; drop the entry under the old name
+        old_name = self._by_id.get(key)
+        if old_name is not None and old_name != name:
+            self._by_name.pop(old_name, None)
+        old_id = self._by_name.get(name)
+        if old_id is not None and str(old_id) != key:
+            self._by_id.pop(str(old_id), None)
+
+        self._by_name[name] = broker_id
+        self._by_name.move_to_end(name)
+        self._by_id[key] = name
+        while len(self._by_name) > self.max_size:
+            evicted_name, evicted_id = self._by_name.popitem(last=False)
+            self._by_id.pop(str(evicted_id), None)
+            self.evictions += 1
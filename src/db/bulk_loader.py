@@ -0,0 +1,185 @@
+import io
+import time
+import uuid
+from itertools import islice
+
+from utils.logger import setup_logger
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Sequence
+
+from db.pool import ConnectionPool, get_pool
+
+# Setup logger
+logger = setup_logger()
+
+# Staging table, target table, columns and merge statement per loaded table.
+# The merge statements keep the ON CONFLICT rules of the repositories'
+# bulk_create methods; children are only merged when their house exists.
+STAGES = {
+    "house": {
+        "stage": "house_stage",
+        "columns": (
+            "id",
+            "zpid",
+            "price",
+            "status",
+            "beds",
+            "baths",
+            "area",
+            "type",
+            "url",
+            "broker_id",
+        ),
+        "merge": """
+            INSERT INTO house (id, zpid, price, status, beds, baths, area, type, url, broker_id)
+            SELECT id, zpid, price, status, beds, baths, area, type, url, broker_id
+            FROM house_stage
+            ON CONFLICT (zpid) DO NOTHING;
+        """,
+    },
+    "address": {
+        "stage": "address_stage",
+        "columns": (
+            "id",
+            "street",
+            "city",
+            "state",
+            "zipcode",
+            "latitude",
+            "longitude",
+            "house_id",
+        ),
+        "merge": """
+            INSERT INTO address (id, street, city, state, zipcode, latitude, longitude, house_id)
+            SELECT s.id, s.street, s.city, s.state, s.zipcode, s.latitude, s.longitude, s.house_id
+            FROM address_stage s
+            WHERE EXISTS (SELECT 1 FROM house h WHERE h.id = s.house_id)
+            ON CONFLICT (id) DO NOTHING;
+        """,
+    },
+    "images": {
+        "stage": "images_stage",
+        "columns": ("id", "house_id", "image_url"),
+        "merge": """
+            INSERT INTO images (id, house_id, image_url)
+            SELECT s.id, s.house_id, s.image_url
+            FROM images_stage s
+            WHERE EXISTS (SELECT 1 FROM house h WHERE h.id = s.house_id)
+            ON CONFLICT (id) DO NOTHING;
+        """,
+    },
+}
+
+
+def _copy_value(value: Any) -> str:
+    """Render one value in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    text = str(value)
+    if any(c in text for c in "\\\t\n\r"):
+        text = (
+            text.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+    return text
+
+
+def _chunks(
+    rows: Iterable[Sequence[Any]], size: int
+) -> Iterator[List[Sequence[Any]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CopyLoader:
+    """Bulk loader for large backfills using COPY FROM STDIN into staging tables.
+
+    Rows are consumed lazily in chunks of ``chunk_rows``; each chunk is rendered
+    into an in-memory buffer, streamed into a temporary staging table and merged
+    into the target table, so client memory stays bounded by the chunk size.
+    """
+
+    def __init__(
+        self, pool: Optional[ConnectionPool] = None, chunk_rows: int = 50000
+    ):
+        self.pool = pool or get_pool()
+        self.chunk_rows = chunk_rows
+        logger.info("CopyLoader initialized")
+
+    def load(
+        self,
+        houses: Iterable[Sequence[Any]] = (),
+        addresses: Iterable[Sequence[Any]] = (),
+        images: Iterable[Sequence[Any]] = (),
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load houses, then addresses, then images in one transaction.
+
+        Rows use the same column order as the repositories' bulk_create methods.
+        Returns per-table counts of staged and merged rows and rows/sec.
+        """
+        report = {}
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    for table, rows in (
+                        ("house", houses),
+                        ("address", addresses),
+                        ("images", images),
+                    ):
+                        report[table] = self._load_table(cur, table, rows)
+        except Exception as e:
+            logger.error(f"Error in COPY bulk load: {str(e)}", exc_info=True)
+            raise
+
+        for table, stats in report.items():
+            logger.info(
+                f"COPY loaded {table}: {stats['merged']}/{stats['staged']} rows "
+                f"in {stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)"
+            )
+        return report
+
+    def _load_table(
+        self, cur, table: str, rows: Iterable[Sequence[Any]]
+    ) -> Dict[str, Any]:
+        spec = STAGES[table]
+        stage = spec["stage"]
+        columns = ", ".join(spec["columns"])
+        copy_sql = f"COPY {stage} ({columns}) FROM STDIN"
+
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+            f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+
+        staged = merged = 0
+        start = time.perf_counter()
+        buffer = io.StringIO()
+        for chunk in _chunks(rows, self.chunk_rows):
+            buffer.seek(0)
+            buffer.truncate()
+            for row in chunk:
+                buffer.write("\t".join(_copy_value(value) for value in row))
+                buffer.write("\n")
+            buffer.seek(0)
+
+            cur.copy_expert(copy_sql, buffer)
+            cur.execute(spec["merge"])
+            merged += cur.rowcount
+            staged += len(chunk)
+            cur.execute(f"TRUNCATE {stage}")
+
+        seconds = time.perf_counter() - start
+        return {
+            "staged": staged,
+            "merged": merged,
+            "skipped": staged - merged,
+            "seconds": seconds,
+            "rows_per_sec": staged / seconds if seconds > 0 else 0.0,
+        }
@@ -0,0 +1,230 @@
+"""EXPLAIN the repositories' lookup queries and flag sequential scans.
+
+Run from src/: python -m db.explain_check
+Exits non-zero when any checked query plans a Seq Scan.
+"""
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from utils.logger import setup_logger
+from db.pool import ConnectionPool, get_pool
+from db.repositories.geo_repo import bbox_sql, radius_sql, search_sql
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Setup logger
+logger = setup_logger()
+
+SAMPLE_UUID = "00000000-0000-0000-0000-000000000000"
+SINCE = datetime.now(timezone.utc) - timedelta(days=30)
+
+# (name, query, params) mirroring the read paths of the repositories
+QUERIES: List[Tuple[str, str, Sequence[Any]]] = [
+    (
+        "BrokerRepository.get_by_name",
+        "SELECT id, name FROM broker WHERE name = %s",
+        ("Sample Realty",),
+    ),
+    (
+        "BrokerRepository.get_by_id",
+        "SELECT id, name FROM broker WHERE id = %s",
+        (SAMPLE_UUID,),
+    ),
+    (
+        "BrokerRepository.search_by_name",
+        "SELECT id, name FROM broker WHERE name ILIKE %s ORDER BY name LIMIT %s",
+        ("%realty%", 100),
+    ),
+    (
+        "BrokerRepository.get_all",
+        "SELECT id, name FROM broker ORDER BY name LIMIT %s OFFSET %s",
+        (100, 0),
+    ),
+    (
+        "HouseRepository.existing_ids",
+        "SELECT id FROM house WHERE id = ANY(%s::uuid[])",
+        ([SAMPLE_UUID],),
+    ),
+    (
+        "HouseRepository zpid conflict lookup",
+        "SELECT id FROM house WHERE zpid = %s",
+        ("123456789",),
+    ),
+    (
+        "AddressRepository.get_by_id",
+        "SELECT id, street, city, state, zipcode, latitude, longitude "
+        "FROM address WHERE id = %s",
+        (SAMPLE_UUID,),
+    ),
+    (
+        "BrokerRepository.get_page",
+        "SELECT id, name FROM broker WHERE name > %s ORDER BY name LIMIT %s",
+        ("Sample Realty", 100),
+    ),
+    (
+        "AddressRepository.search_by_zipcode_page",
+        "SELECT id, street, city, state, zipcode, latitude, longitude "
+        "FROM address WHERE zipcode = %s AND id > %s ORDER BY id LIMIT %s",
+        ("94103", SAMPLE_UUID, 100),
+    ),
+    (
+        "ImagesRepository.get_by_house_id_page",
+        "SELECT id, house_id, url FROM house_images "
+        "WHERE house_id = %s AND id > %s ORDER BY id LIMIT %s",
+        (SAMPLE_UUID, SAMPLE_UUID, 100),
+    ),
+    (
+        "AddressRepository.search_by_zipcode",
+        "SELECT id, street, city, state, zipcode, latitude, longitude "
+        "FROM address WHERE zipcode = %s",
+        ("94103",),
+    ),
+    (
+        "ImagesRepository.get_by_house_id",
+        "SELECT id, house_id, url FROM house_images WHERE house_id = %s ORDER BY id",
+        (SAMPLE_UUID,),
+    ),
+    (
+        "CheckpointRepository.load",
+        "SELECT last_page, cursor, completed FROM crawl_checkpoint "
+        "WHERE crawl_key = %s",
+        ("california",),
+    ),
+    (
+        "HouseHistoryRepository.price_trajectory",
+        "SELECT observed_at, price, status FROM house_history "
+        "WHERE zpid = %s AND observed_at >= %s ORDER BY observed_at",
+        ("123456789", SINCE),
+    ),
+    (
+        "HouseHistoryRepository.changes_in_zipcode",
+        "SELECT hh.zpid, hh.house_id, hh.price, hh.status, hh.observed_at "
+        "FROM house_history hh JOIN address a ON a.house_id = hh.house_id "
+        "WHERE a.zipcode = %s AND hh.observed_at >= %s ORDER BY hh.observed_at",
+        ("94103", SINCE),
+    ),
+]
+
+# GeoSearchRepository queries per backend of migration 005; only the
+# backend whose extension is installed is checked
+GEO_PARAMS = {
+    "lat": 37.77,
+    "lon": -122.42,
+    "radius": 2000.0,
+    "south": 37.75,
+    "west": -122.45,
+    "north": 37.79,
+    "east": -122.39,
+    "after_distance": 100.0,
+    "after_id": SAMPLE_UUID,
+    "limit": 100,
+}
+
+
+def geo_queries(backend: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """GeoSearchRepository's radius and box queries for one backend."""
+    queries = []
+    for method, within in (
+        ("search_radius", radius_sql(backend)),
+        ("search_bbox", bbox_sql(backend)),
+    ):
+        name = f"GeoSearchRepository.{method}"
+        queries.append((f"{name} ({backend})", search_sql(backend, within), GEO_PARAMS))
+        queries.append(
+            (
+                f"{name} ({backend}, next page)",
+                search_sql(backend, within, keyset=True),
+                GEO_PARAMS,
+            )
+        )
+    return queries
+
+
+# Query name -> extension it needs
+GEO_EXTENSIONS: Dict[str, str] = {}
+for backend in ("postgis", "earthdistance"):
+    for query in geo_queries(backend):
+        QUERIES.append(query)
+        GEO_EXTENSIONS[query[0]] = backend
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Relations read by a Seq Scan anywhere in a JSON plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", ()):
+        found.extend(seq_scans(child))
+    return found
+
+
+class ExplainChecker:
+    """Plan each query and report the relations it would scan sequentially.
+
+    Small or empty tables are always cheaper to scan, so by default the
+    check runs with ``enable_seqscan = off``: a Seq Scan that survives that
+    means no index can serve the query at all.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ConnectionPool] = None,
+        queries: Sequence[Tuple[str, str, Sequence[Any]]] = QUERIES,
+        force_index: bool = True,
+    ):
+        self.pool = pool or get_pool()
+        self.queries = queries
+        self.force_index = force_index
+
+    def run(self) -> List[Dict[str, Any]]:
+        """One ``{"name", "seq_scans", "plan"}`` entry per query.
+
+        Geo queries for a backend whose extension is not installed are left
+        out, since they could not even be planned.
+        """
+        results = []
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT extname FROM pg_extension;")
+                installed = {row[0] for row in cur.fetchall()}
+                if self.force_index:
+                    cur.execute("SET LOCAL enable_seqscan = off;")
+                for name, query, params in self.queries:
+                    extension = GEO_EXTENSIONS.get(name)
+                    if extension is not None and extension not in installed:
+                        continue
+                    cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+                    plan = cur.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    root = plan[0]["Plan"]
+                    results.append(
+                        {"name": name, "seq_scans": seq_scans(root), "plan": root}
+                    )
+            # EXPLAIN without ANALYZE changes nothing; drop the SET LOCAL too
+            conn.rollback()
+        return results
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--allow-seqscan",
+        action="store_true",
+        help="plan with the planner's normal costs instead of forcing indexes",
+    )
+    args = arg_parser.parse_args()
+
+    results = ExplainChecker(force_index=not args.allow_seqscan).run()
+    flagged = 0
+    for result in results:
+        if result["seq_scans"]:
+            flagged += 1
+            print(f"SEQ SCAN  {result['name']}: {', '.join(result['seq_scans'])}")
+        else:
+            print(f"ok        {result['name']}")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from utils.logger import setup_logger
+from utils.metrics import get_metrics
+from typing import Callable, List, Dict, Any, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from db.pool import ConnectionPool
+from db.repositories.house_repo import HouseRepository
+from db.repositories.address_repo import AddressRepository
+from db.repositories.images_repo import ImagesRepository
+from db.repositories.history_repo import HouseHistoryRepository
+
+# Setup logger
+logger = setup_logger()
+
+TABLES = ("house", "address", "images")
+
+
+def new_summary() -> Dict[str, Any]:
+    """Empty per-table counters of inserted, skipped and failed rows.
+
+    ``duplicate`` counts rows repeating a house already in the same page.
+    """
+    summary: Dict[str, Any] = {
+        table: {"inserted": 0, "updated": 0, "skipped": 0, "duplicate": 0, "failed": 0}
+        for table in TABLES
+    }
+    summary["history"] = 0
+    summary["committed"] = False
+    return summary
+
+
+class PageIngestor:
+    """Write one parsed page of listings with set-based statements in one transaction."""
+
+    def __init__(
+        self,
+        house_repo: HouseRepository,
+        address_repo: AddressRepository,
+        image_repo: ImagesRepository,
+        pool: Optional[ConnectionPool] = None,
+        link_existing: bool = False,
+        upsert: bool = False,
+        history: Optional[HouseHistoryRepository] = None,
+    ):
+        """With ``link_existing`` (for deterministic ids), children of houses
+        skipped on a zpid conflict are still written when the house id they
+        reference already exists, so re-crawls pick up new images. With
+        ``upsert``, existing houses whose content changed are updated and
+        unchanged ones are counted as skipped. ``history`` (upsert only)
+        records price/status changes in the same transaction."""
+        if history is not None and not upsert:
+            raise ValueError("house history requires upsert mode")
+        self.house_repo = house_repo
+        self.address_repo = address_repo
+        self.image_repo = image_repo
+        self.pool = pool or house_repo.pool
+        self.link_existing = link_existing
+        self.upsert = upsert
+        self.history = history
+
+    def ingest(
+        self,
+        houses: List[List[Any]],
+        addresses: List[List[Any]],
+        images: List[List[Any]],
+        checkpoint: Optional[Callable[[Any], None]] = None,
+    ) -> Dict[str, Any]:
+        """Insert a page of house, address and image rows.
+
+        Children of houses that were skipped on a zpid conflict are not written.
+        ``checkpoint(cur)``, if given, runs last inside the same transaction.
+        If the transaction fails, every row of the page is counted as failed.
+        """
+        summary = new_summary()
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    self._write(cur, houses, addresses, images, summary)
+                    if checkpoint is not None:
+                        checkpoint(cur)
+            summary["committed"] = True
+        except Exception as e:
+            logger.error(f"Error ingesting page batch: {str(e)}", exc_info=True)
+            summary = new_summary()
+            summary["house"]["failed"] = len(houses)
+            summary["address"]["failed"] = len(addresses)
+            summary["images"]["failed"] = len(images)
+        self._record(summary)
+        return summary
+
+    @staticmethod
+    def _record(summary: Dict[str, Any]) -> None:
+        metrics = get_metrics()
+        for table in TABLES:
+            for outcome, count in summary[table].items():
+                if count:
+                    metrics.inc(
+                        "ingest_rows_total",
+                        count,
+                        "Rows per table by ingest outcome",
+                        table=table,
+                        outcome=outcome,
+                    )
+        metrics.inc(
+            "page_transactions_total",
+            help="Page ingest transactions",
+            committed=summary["committed"],
+        )
+
+    def _write(self, cur, houses, addresses, images, summary) -> None:
+        if self.history is not None:
+            # Compared against the house rows before they are updated
+            summary["history"] = self.history.record_changes(cur, houses)
+        if self.upsert:
+            result = self.house_repo.upsert_batch(cur, houses)
+            inserted = result["inserted"]
+            summary["house"]["updated"] = len(result["changed"])
+        else:
+            inserted = self.house_repo.insert_batch(cur, houses)
+        inserted_ids = {str(row["id"]) for row in inserted}
+        # A zpid listed twice in a page is written once; the repeat is not a
+        # conflict with an existing row, so it is not counted as skipped
+        duplicates = len(houses) - len({str(row[1]) for row in houses})
+        summary["house"]["inserted"] = len(inserted)
+        summary["house"]["duplicate"] = duplicates
+        summary["house"]["skipped"] = (
+            len(houses) - len(inserted) - summary["house"]["updated"] - duplicates
+        )
+        if self.link_existing:
+            skipped_ids = [row[0] for row in houses if str(row[0]) not in inserted_ids]
+            inserted_ids |= self.house_repo.existing_ids(cur, skipped_ids)
+
+        # Only keep children whose house row was inserted in this transaction
+        # (or already exists, with link_existing); the rest count as skipped.
+        address_count = self.address_repo.insert_batch(
+            cur, [row for row in addresses if str(row[7]) in inserted_ids]
+        )
+        summary["address"]["inserted"] = address_count
+        summary["address"]["skipped"] = len(addresses) - address_count
+
+        image_count = self.image_repo.insert_batch(
+            cur, [row for row in images if str(row[1]) in inserted_ids]
+        )
+        summary["images"]["inserted"] = image_count
+        summary["images"]["skipped"] = len(images) - image_count
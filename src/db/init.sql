@@ -0,0 +1,88 @@
+-- Schema for the scraper's PostgreSQL database.
+-- Every statement is idempotent; db/migrate.py applies this file and then the
+-- numbered files in db/migrations that have not been recorded yet.
+
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS broker (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    name TEXT NOT NULL,
+    -- Upserts and get_by_name / ORDER BY name lookups
+    CONSTRAINT broker_name_unique UNIQUE (name)
+);
+
+-- search_by_name: name ILIKE '%pattern%'
+CREATE INDEX IF NOT EXISTS idx_broker_name_trgm ON broker USING gin (name gin_trgm_ops);
+
+CREATE TABLE IF NOT EXISTS house (
+    id UUID PRIMARY KEY,
+    zpid TEXT NOT NULL,
+    price NUMERIC,
+    status TEXT,
+    beds INTEGER,
+    baths INTEGER,
+    area NUMERIC,
+    type TEXT,
+    url TEXT,
+    broker_id UUID REFERENCES broker (id) ON DELETE SET NULL,
+    content_hash TEXT,
+    -- ON CONFLICT (zpid) target of every house insert and upsert
+    CONSTRAINT house_zpid_unique UNIQUE (zpid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_house_broker_id ON house (broker_id);
+
+CREATE TABLE IF NOT EXISTS address (
+    id UUID PRIMARY KEY,
+    street TEXT,
+    city TEXT,
+    state TEXT,
+    zipcode TEXT,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    house_id UUID NOT NULL REFERENCES house (id) ON DELETE CASCADE
+);
+
+-- search_by_zipcode and its keyset pages (zipcode, id > last)
+CREATE INDEX IF NOT EXISTS idx_address_zipcode_id ON address (zipcode, id);
+CREATE INDEX IF NOT EXISTS idx_address_house_id ON address (house_id);
+
+CREATE TABLE IF NOT EXISTS images (
+    id UUID PRIMARY KEY,
+    house_id UUID NOT NULL REFERENCES house (id) ON DELETE CASCADE,
+    image_url TEXT NOT NULL
+);
+
+-- get_by_house_id / delete_by_house_id and keyset pages ordered by id
+CREATE INDEX IF NOT EXISTS idx_images_house_id_id ON images (house_id, id);
+
+-- ImagesRepository's single-row methods use house_images (id, house_id, url);
+-- this updatable view maps them onto the images table and its indexes.
+DO $$
+BEGIN
+    IF to_regclass('house_images') IS NULL THEN
+        CREATE VIEW house_images AS
+            SELECT id, house_id, image_url AS url FROM images;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS crawl_checkpoint (
+    crawl_key TEXT PRIMARY KEY,
+    last_page INTEGER NOT NULL DEFAULT 0,
+    cursor JSONB NOT NULL DEFAULT '{}'::jsonb,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Monthly partitions are created by HouseHistoryRepository.ensure_table
+CREATE TABLE IF NOT EXISTS house_history (
+    zpid TEXT NOT NULL,
+    house_id UUID NOT NULL,
+    price NUMERIC,
+    status TEXT,
+    observed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+) PARTITION BY RANGE (observed_at);
+
+CREATE INDEX IF NOT EXISTS idx_house_history_zpid ON house_history (zpid, observed_at);
+CREATE INDEX IF NOT EXISTS idx_house_history_house_id ON house_history (house_id, observed_at);
@@ -0,0 +1,127 @@
+"""Apply init.sql and pending numbered migrations.
+
+Run from src/: python -m db.migrate [--status]
+"""
+import os
+import argparse
+
+from utils.logger import setup_logger
+from db.pool import ConnectionPool, get_pool
+from typing import List, Optional, Set, Tuple
+
+# Setup logger
+logger = setup_logger()
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+INIT_SQL = os.path.join(DB_DIR, "init.sql")
+MIGRATIONS_DIR = os.path.join(DB_DIR, "migrations")
+
+# Serializes concurrent runners (e.g. several scraper containers starting)
+LOCK_KEY = 727_001
+
+
+class MigrationRunner:
+    """Versioned schema migrations recorded in ``schema_migrations``.
+
+    A migration's version is its file name without ``.sql``; files apply in
+    name order, each in its own transaction together with its record.
+    ``init.sql`` is idempotent and runs first on every migrate.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ConnectionPool] = None,
+        migrations_dir: str = MIGRATIONS_DIR,
+        init_sql: Optional[str] = INIT_SQL,
+    ):
+        self.pool = pool or get_pool()
+        self.migrations_dir = migrations_dir
+        self.init_sql = init_sql
+
+    def available(self) -> List[Tuple[str, str]]:
+        """(version, path) of every migration file, in apply order."""
+        return [
+            (name[: -len(".sql")], os.path.join(self.migrations_dir, name))
+            for name in sorted(os.listdir(self.migrations_dir))
+            if name.endswith(".sql")
+        ]
+
+    def applied(self) -> Set[str]:
+        query = """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            SELECT version FROM schema_migrations;
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query)
+                return {row[0] for row in cur.fetchall()}
+
+    def pending(self) -> List[Tuple[str, str]]:
+        applied = self.applied()
+        return [item for item in self.available() if item[0] not in applied]
+
+    def migrate(self) -> List[str]:
+        """Apply everything pending; returns the versions applied."""
+        if self.init_sql:
+            self._execute_file("init", self.init_sql)
+
+        done = []
+        for version, path in self.pending():
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_xact_lock(%s);", (LOCK_KEY,))
+                    # Another runner may have applied it while we waited
+                    cur.execute(
+                        "SELECT 1 FROM schema_migrations WHERE version = %s;",
+                        (version,),
+                    )
+                    if cur.fetchone():
+                        continue
+                    logger.info(f"Applying migration {version}")
+                    with open(path, "r") as f:
+                        try:
+                            cur.execute(f.read())
+                        except Exception as e:
+                            logger.error(f"Error applying {version}: {str(e)}")
+                            raise
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version) VALUES (%s);",
+                        (version,),
+                    )
+            done.append(version)
+        logger.info(f"Applied migrations: {done or 'none pending'}")
+        return done
+
+    def _execute_file(self, name: str, path: str) -> None:
+        with open(path, "r") as f:
+            sql = f.read()
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_xact_lock(%s);", (LOCK_KEY,))
+                    cur.execute(sql)
+        except Exception as e:
+            logger.error(f"Error applying {name}: {str(e)}")
+            raise
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--status", action="store_true", help="list pending migrations only"
+    )
+    args = arg_parser.parse_args()
+
+    runner = MigrationRunner()
+    if args.status:
+        for version, _ in runner.pending():
+            print(f"pending  {version}")
+    else:
+        runner.migrate()
+
+
+if __name__ == "__main__":
+    main()
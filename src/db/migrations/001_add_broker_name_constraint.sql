@@ -0,0 +1,9 @@
+-- Add unique constraint to broker name
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'broker_name_unique'
+    ) THEN
+        ALTER TABLE broker ADD CONSTRAINT broker_name_unique UNIQUE (name);
+    END IF;
+END $$;
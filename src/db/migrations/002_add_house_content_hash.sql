@@ -0,0 +1,2 @@
+-- Content hash used by the change-detecting house upsert
+ALTER TABLE house ADD COLUMN IF NOT EXISTS content_hash TEXT;
@@ -0,0 +1,15 @@
+-- Indexes for the repositories' lookup paths on databases created before init.sql
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- BrokerRepository.search_by_name: name ILIKE '%pattern%'
+CREATE INDEX IF NOT EXISTS idx_broker_name_trgm ON broker USING gin (name gin_trgm_ops);
+
+-- AddressRepository.search_by_zipcode and history joins by house
+CREATE INDEX IF NOT EXISTS idx_address_zipcode ON address (zipcode);
+CREATE INDEX IF NOT EXISTS idx_address_house_id ON address (house_id);
+
+-- ImagesRepository.get_by_house_id / delete_by_house_id
+CREATE INDEX IF NOT EXISTS idx_images_house_id ON images (house_id);
+
+-- Broker deletes check house.broker_id
+CREATE INDEX IF NOT EXISTS idx_house_broker_id ON house (broker_id);
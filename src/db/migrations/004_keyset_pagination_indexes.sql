@@ -0,0 +1,6 @@
+-- Keyset pages filter on one column and order by id; cover both
+CREATE INDEX IF NOT EXISTS idx_address_zipcode_id ON address (zipcode, id);
+DROP INDEX IF EXISTS idx_address_zipcode;
+
+CREATE INDEX IF NOT EXISTS idx_images_house_id_id ON images (house_id, id);
+DROP INDEX IF EXISTS idx_images_house_id;
@@ -0,0 +1,18 @@
+-- Spatial index for GeoSearchRepository: PostGIS when the server ships it,
+-- otherwise cube/earthdistance. The indexed expressions must match
+-- POSTGIS_POINT / EARTH_POINT in db/repositories/geo_repo.py.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'postgis') THEN
+        CREATE EXTENSION IF NOT EXISTS postgis;
+        CREATE INDEX IF NOT EXISTS idx_address_geog ON address USING gist (
+            (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography)
+        );
+    ELSE
+        CREATE EXTENSION IF NOT EXISTS cube;
+        CREATE EXTENSION IF NOT EXISTS earthdistance;
+        CREATE INDEX IF NOT EXISTS idx_address_earth ON address USING gist (
+            ll_to_earth(latitude, longitude)
+        );
+    END IF;
+END $$;
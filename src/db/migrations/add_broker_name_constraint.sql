@@ -1,2 +0,0 @@
--- Add unique constraint to broker name
-ALTER TABLE broker ADD CONSTRAINT broker_name_unique UNIQUE (name); 
\ No newline at end of file
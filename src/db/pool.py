@@ -0,0 +1,266 @@
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+from utils.logger import setup_logger
+from typing import Dict, Any, List, Optional, Iterator
+
+import psycopg2
+from psycopg2 import extensions
+
+load_dotenv()
+
+# Setup logger
+logger = setup_logger()
+
+default_dsn = os.getenv("postgresql_dsn")
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be borrowed within the timeout."""
+
+
+class _PooledConnection:
+    """Book-keeping wrapper around a raw psycopg2 connection."""
+
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of PostgreSQL connections shared by all repositories.
+
+    Connections are opened lazily up to ``max_size``. On borrow a connection is
+    health-checked (``SELECT 1`` once it has been idle longer than
+    ``health_check_after`` seconds) and recycled once it is older than
+    ``max_lifetime`` seconds.
+    """
+
+    def __init__(
+        self,
+        dsn: str = default_dsn,
+        min_size: int = 0,
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        health_check_after: float = 30.0,
+        timeout: float = 30.0,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool size: min_size={min_size}, max_size={max_size}"
+            )
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+
+        self._idle: List[_PooledConnection] = []
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+
+        # Stats
+        self._borrows = 0
+        self._borrow_wait_total = 0.0
+        self._borrow_wait_max = 0.0
+        self._created = 0
+        self._recycled = 0
+        self._failed_health_checks = 0
+        self._timeouts = 0
+
+        for _ in range(min_size):
+            self._idle.append(self._open())
+        logger.info(f"ConnectionPool initialized (min={min_size}, max={max_size})")
+
+    def _open(self) -> _PooledConnection:
+        conn = psycopg2.connect(self.dsn)
+        self._created += 1
+        return _PooledConnection(conn)
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        try:
+            pooled.conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        """Check that a connection is still usable before handing it out."""
+        if pooled.conn.closed:
+            return False
+        if time.monotonic() - pooled.created_at > self.max_lifetime:
+            self._recycled += 1
+            return False
+        if time.monotonic() - pooled.last_used_at < self.health_check_after:
+            return True
+        try:
+            with pooled.conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            pooled.conn.rollback()
+            return True
+        except Exception:
+            self._failed_health_checks += 1
+            return False
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Borrow a connection from the pool, waiting up to ``timeout`` seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        pooled = None
+        with self._cond:
+            if self._closed:
+                raise PoolTimeout("Connection pool is closed")
+            while not self._idle and len(self._in_use) >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"Could not borrow a connection within {timeout}s"
+                    )
+                self._cond.wait(remaining)
+            if self._idle:
+                pooled = self._idle.pop()
+            # Reserve the slot before releasing the lock so concurrent
+            # borrowers cannot overshoot max_size while we connect.
+            slot = object() if pooled is None else pooled
+            self._in_use[id(slot)] = slot
+
+        if pooled is not None and not self._is_healthy(pooled):
+            self._discard(pooled)
+            pooled = None
+
+        if pooled is None:
+            try:
+                pooled = self._open()
+            except Exception:
+                with self._cond:
+                    self._in_use.pop(id(slot), None)
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            self._in_use.pop(id(slot), None)
+            self._in_use[id(pooled.conn)] = pooled
+            waited = time.monotonic() - start
+            self._borrows += 1
+            self._borrow_wait_total += waited
+            self._borrow_wait_max = max(self._borrow_wait_max, waited)
+        return pooled.conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        """Return a borrowed connection to the pool."""
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+            if pooled is None:
+                raise ValueError("Connection does not belong to this pool")
+
+            if not close and not conn.closed:
+                try:
+                    status = conn.get_transaction_status()
+                    if status != extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                except Exception:
+                    close = True
+
+            if close or conn.closed or self._closed:
+                self._discard(pooled)
+            else:
+                pooled.last_used_at = time.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of a transaction.
+
+        Commits on success and rolls back on error, mirroring the semantics of
+        ``with psycopg2.connect(dsn) as conn``, then returns the connection.
+        """
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken or conn.closed)
+
+    def stream(
+        self,
+        query: str,
+        params: Any = None,
+        itersize: int = 2000,
+        cursor_factory: Any = None,
+    ) -> Iterator[Any]:
+        """Yield the rows of ``query`` from a named server-side cursor.
+
+        Rows arrive ``itersize`` at a time, so memory stays flat however large
+        the result. The connection is held until the iterator is exhausted or
+        closed, and its transaction is rolled back either way.
+        """
+        with self.connection() as conn:
+            name = f"stream_{uuid.uuid4().hex}"
+            with conn.cursor(name=name, cursor_factory=cursor_factory) as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                for row in cur:
+                    yield row
+            conn.rollback()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage counters."""
+        with self._cond:
+            return {
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "borrows": self._borrows,
+                "borrow_wait_total": self._borrow_wait_total,
+                "borrow_wait_avg": (
+                    self._borrow_wait_total / self._borrows if self._borrows else 0.0
+                ),
+                "borrow_wait_max": self._borrow_wait_max,
+                "created": self._created,
+                "recycled": self._recycled,
+                "failed_health_checks": self._failed_health_checks,
+                "timeouts": self._timeouts,
+            }
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further borrows."""
+        with self._cond:
+            self._closed = True
+            for pooled in self._idle:
+                self._discard(pooled)
+            self._idle.clear()
+            self._cond.notify_all()
+        logger.info("ConnectionPool closed")
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dsn: str = default_dsn, **kwargs) -> ConnectionPool:
+    """Return the process-wide pool for ``dsn``, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(dsn, **kwargs)
+            _pools[dsn] = pool
+        return pool
@@ -3,8 +3,11 @@ import logging
 from decimal import Decimal
 from dotenv import load_dotenv
 
-from utils.logger import setup_logger
-from typing import List, Dict, Any, Optional, Union
+from utils.logger import get_item_logger, setup_logger
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from db.rows import Address, row_cursor
+from typing import List, Dict, Any, Iterator, Optional, Union
 
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
@@ -13,14 +16,27 @@ load_dotenv()
 
 # Setup logger
 logger = setup_logger()
+item_logger = get_item_logger()
 
 default_dsn = os.getenv("postgresql_dsn")
 
 
+@instrument_methods("address")
 class AddressRepository:
-    def __init__(self, dsn: str = default_dsn):
-        """Initialize database connection with a DSN (Data Source Name)."""
+    def __init__(
+        self,
+        dsn: str = default_dsn,
+        pool: Optional[ConnectionPool] = None,
+        compact_rows: bool = False,
+    ):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN.
+
+        With ``compact_rows``, get_by_id and the zipcode searches return
+        Address namedtuples (db.rows) instead of dicts.
+        """
         self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        self.row_cursor = row_cursor(Address) if compact_rows else RealDictCursor
         logger.info("AddressRepository initialized")
 
     def create(self, address_data: List[Any]) -> Union[Optional[Dict[str, Any]], None]:
@@ -35,8 +51,8 @@ class AddressRepository:
         """
         try:
 
-            logger.info(f"Address data: {address_data}")
-            with psycopg2.connect(self.dsn) as conn:
+            item_logger.debug("Address data: %s", address_data)
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Format the data
                     id, street, city, state, zipcode, lat, lon, house_id = address_data
@@ -53,8 +69,9 @@ class AddressRepository:
                     cur.execute(query, formatted_data)
                     conn.commit()
                     cur.execute("SELECT * FROM address WHERE id = %s", (id,))
-                    logger.info(f"Address created: {cur.fetchone()}")
-                    return cur.fetchone()
+                    address = cur.fetchone()
+                    item_logger.debug("Address created: %s", address)
+                    return address
         except Exception as e:
             logger.error(f"Error creating address: {str(e)}")
             raise
@@ -67,7 +84,7 @@ class AddressRepository:
             ON CONFLICT (id) DO NOTHING
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # First verify that all house_ids exist
                     house_ids = [str(row[7]) for row in addresses if row[7] is not None]
@@ -132,8 +149,8 @@ class AddressRepository:
             WHERE id = %s;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     cur.execute(query, (address_id,))
                     return cur.fetchone()
         except Exception as e:
@@ -157,7 +174,7 @@ class AddressRepository:
             RETURNING id, street, city, state, zipcode, latitude, longitude;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     address_data["id"] = address_id
                     # Convert lat/long to Decimal if present
@@ -184,7 +201,7 @@ class AddressRepository:
             RETURNING id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (address_id,))
                     conn.commit()
@@ -201,10 +218,78 @@ class AddressRepository:
             WHERE zipcode = %s;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     cur.execute(query, (zipcode,))
                     return cur.fetchall()
         except Exception as e:
             logger.error(f"Error searching address by zipcode {zipcode}: {str(e)}")
             raise
+
+    def search_by_zipcode_page(
+        self, zipcode: str, after_id: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Keyset-paginated addresses in a zipcode, ordered by id.
+
+        Pass the last id of the previous page as ``after_id``.
+        """
+        query = f"""
+            SELECT id, street, city, state, zipcode, latitude, longitude
+            FROM address
+            WHERE zipcode = %s
+            {"AND id > %s" if after_id is not None else ""}
+            ORDER BY id
+            LIMIT %s;
+        """
+        params = [zipcode] + ([str(after_id)] if after_id is not None else [])
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
+                    cur.execute(query, params + [limit])
+                    return cur.fetchall()
+        except Exception as e:
+            logger.error(f"Error searching address by zipcode {zipcode}: {str(e)}")
+            raise
+
+    def iter_by_zipcode(
+        self, zipcode: str, itersize: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream addresses in a zipcode from a server-side cursor."""
+        query = """
+            SELECT id, street, city, state, zipcode, latitude, longitude
+            FROM address
+            WHERE zipcode = %s
+            ORDER BY id;
+        """
+        return self.pool.stream(
+            query, (zipcode,), itersize=itersize, cursor_factory=self.row_cursor
+        )
+
+    def insert_batch(self, cur, addresses: List[List[Any]]) -> int:
+        """Insert addresses on a caller-owned cursor without committing.
+
+        The caller is responsible for only passing addresses whose house rows
+        were inserted in the same transaction. Returns the number of rows inserted.
+        """
+        query = """
+            INSERT INTO address (id, street, city, state, zipcode, latitude, longitude, house_id)
+            VALUES %s
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id;
+        """
+        if not addresses:
+            return 0
+        values = [
+            (
+                str(id),
+                street,
+                city,
+                state,
+                zipcode,
+                Decimal(lat) if lat is not None else None,
+                Decimal(lon) if lon is not None else None,
+                str(house_id) if house_id is not None else None,
+            )
+            for id, street, city, state, zipcode, lat, lon, house_id in addresses
+        ]
+        return len(execute_values(cur, query, values, fetch=True))
@@ -3,7 +3,11 @@ import uuid
 import logging
 from dotenv import load_dotenv
 from utils.logger import setup_logger
-from typing import List, Dict, Any, Optional
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from db.rows import Broker, row_cursor
+from db.broker_cache import BrokerCache
+from typing import List, Dict, Any, Iterator, Optional
 
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
@@ -16,10 +20,26 @@ logger = setup_logger()
 default_dsn = os.getenv("postgresql_dsn")
 
 
+@instrument_methods("broker")
 class BrokerRepository:
-    def __init__(self, dsn: str = default_dsn):
-        """Initialize database connection with a DSN (Data Source Name)."""
+    def __init__(
+        self,
+        dsn: str = default_dsn,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[BrokerCache] = None,
+        compact_rows: bool = False,
+    ):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN.
+
+        An optional BrokerCache makes get_by_name answer from memory; it is kept
+        up to date by every method that creates, renames or deletes brokers.
+        With ``compact_rows``, get_by_id, get_all, get_page, iter_all and
+        search_by_name return Broker namedtuples (db.rows) instead of dicts.
+        """
         self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        self.cache = cache
+        self.row_cursor = row_cursor(Broker) if compact_rows else RealDictCursor
         logger.info("BrokerRepository initialized")
 
     def bulk_create(self, broker_names: List[str]) -> List[Dict[str, Any]]:
@@ -32,15 +52,16 @@ class BrokerRepository:
             RETURNING id, name;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Generate tuples of (uuid, name) for each unique name
                     unique_names = list(set(broker_names))  # Remove duplicates
                     values = [(str(uuid.uuid4()), name) for name in unique_names]
-                    execute_values(cur, query, values)
+                    brokers = execute_values(cur, query, values, fetch=True)
                     conn.commit()
                     logger.info(f"brokers have been successfully created")
-                    return cur.fetchall()
+                    self._remember(brokers)
+                    return brokers
         except Exception as e:
             logger.error(f"Error bulk creating brokers: {str(e)}")
             raise
@@ -57,16 +78,17 @@ class BrokerRepository:
             RETURNING b.id, b.name;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Convert list of dicts to list of tuples (id, name)
                     values = [
                         (update["id"], update["name"]) for update in broker_updates
                     ]
-                    execute_values(cur, query, values)
+                    brokers = execute_values(cur, query, values, fetch=True)
                     conn.commit()
                     logger.info(f"brokers have been successfully updated")
-                    return cur.fetchall()
+                    self._remember(brokers)
+                    return brokers
         except Exception as e:
             logger.error(f"Error bulk updating brokers: {str(e)}")
             raise
@@ -93,13 +115,14 @@ class BrokerRepository:
             JOIN broker b ON b.name = ib.name;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Convert list of names to list of single-item tuples
                     values = [(name,) for name in broker_names]
-                    execute_values(cur, query, values)
+                    brokers = execute_values(cur, query, values, fetch=True)
                     conn.commit()
-                    return cur.fetchall()
+                    self._remember(brokers)
+                    return brokers
         except Exception as e:
             logger.error(f"Error in bulk get_or_create for brokers: {str(e)}")
             raise
@@ -112,11 +135,15 @@ class BrokerRepository:
             RETURNING id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (broker_ids,))
                     conn.commit()
-                    return [row["id"] for row in cur.fetchall()]
+                    deleted = [row["id"] for row in cur.fetchall()]
+                    if self.cache is not None:
+                        for broker_id in deleted:
+                            self.cache.evict_id(broker_id)
+                    return deleted
         except Exception as e:
             logger.error(f"Error bulk deleting brokers: {str(e)}")
             raise
@@ -129,12 +156,14 @@ class BrokerRepository:
             RETURNING id, name;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     broker_id = str(uuid.uuid4())  # Generate UUID
                     cur.execute(query, (broker_id, broker_name))
                     conn.commit()
-                    return cur.fetchone()
+                    broker = cur.fetchone()
+                    self._remember([broker])
+                    return broker
         except Exception as e:
             logger.error(f"Error creating broker: {str(e)}")
             raise
@@ -147,8 +176,8 @@ class BrokerRepository:
             WHERE id = %s;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     cur.execute(query, (broker_id,))
                     return cur.fetchone()
         except Exception as e:
@@ -156,17 +185,24 @@ class BrokerRepository:
             raise
 
     def get_by_name(self, broker_name: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a broker by name."""
+        """Retrieve a broker by name, from the cache when possible."""
+        if self.cache is not None:
+            broker_id = self.cache.get(broker_name)
+            if broker_id is not None:
+                return {"id": broker_id, "name": broker_name}
+
         query = """
             SELECT id, name
             FROM broker
             WHERE name = %s;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (broker_name,))
-                    return cur.fetchone()
+                    broker = cur.fetchone()
+                    self._remember([broker])
+                    return broker
         except Exception as e:
             logger.error(f"Error getting broker by name {broker_name}: {str(e)}")
             raise
@@ -180,14 +216,48 @@ class BrokerRepository:
             LIMIT %s OFFSET %s;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     cur.execute(query, (limit, offset))
                     return cur.fetchall()
         except Exception as e:
             logger.error(f"Error getting all brokers: {str(e)}")
             raise
 
+    def get_page(
+        self, after_name: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Keyset-paginated brokers ordered by name.
+
+        Pass the last name of the previous page as ``after_name``; unlike
+        OFFSET, every page costs one index range scan.
+        """
+        query = f"""
+            SELECT id, name
+            FROM broker
+            {"WHERE name > %s" if after_name is not None else ""}
+            ORDER BY name
+            LIMIT %s;
+        """
+        params = (after_name, limit) if after_name is not None else (limit,)
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
+                    cur.execute(query, params)
+                    return cur.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting brokers after {after_name}: {str(e)}")
+            raise
+
+    def iter_all(self, itersize: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Stream every broker ordered by name from a server-side cursor."""
+        query = """
+            SELECT id, name
+            FROM broker
+            ORDER BY name;
+        """
+        return self.pool.stream(query, itersize=itersize, cursor_factory=self.row_cursor)
+
     def update(self, broker_id: str, new_name: str) -> Optional[Dict[str, Any]]:
         """Update a broker's name."""
         query = """
@@ -197,11 +267,13 @@ class BrokerRepository:
             RETURNING id, name;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (new_name, broker_id))
                     conn.commit()
-                    return cur.fetchone()
+                    broker = cur.fetchone()
+                    self._remember([broker])
+                    return broker
         except Exception as e:
             logger.error(f"Error updating broker {broker_id}: {str(e)}")
             raise
@@ -214,10 +286,12 @@ class BrokerRepository:
             RETURNING id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (broker_id,))
                     conn.commit()
+                    if self.cache is not None:
+                        self.cache.evict_id(broker_id)
                     return cur.fetchone() is not None
         except Exception as e:
             logger.error(f"Error deleting broker {broker_id}: {str(e)}")
@@ -226,7 +300,7 @@ class BrokerRepository:
     def get_or_create(self, broker_name: str) -> Dict[str, Any]:
         """Get a broker by name or create if it doesn't exist."""
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # First try to get existing broker
                     get_query = """
@@ -238,6 +312,7 @@ class BrokerRepository:
                     broker = cur.fetchone()
 
                     if broker:
+                        self._remember([broker])
                         return broker
 
                     # If not found, create new broker
@@ -249,7 +324,9 @@ class BrokerRepository:
                     broker_id = str(uuid.uuid4())
                     cur.execute(create_query, (broker_id, broker_name))
                     conn.commit()
-                    return cur.fetchone()
+                    broker = cur.fetchone()
+                    self._remember([broker])
+                    return broker
         except Exception as e:
             logger.error(
                 f"Error in get_or_create for broker name {broker_name}: {str(e)}"
@@ -268,8 +345,8 @@ class BrokerRepository:
             LIMIT %s;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     cur.execute(query, (f"%{name_pattern}%", limit))
                     return cur.fetchall()
         except Exception as e:
@@ -277,3 +354,28 @@ class BrokerRepository:
                 f"Error searching brokers by name pattern {name_pattern}: {str(e)}"
             )
             raise
+
+    def warm_cache(self, limit: Optional[int] = None) -> int:
+        """Fill the cache from the broker table; returns the number of brokers loaded."""
+        if self.cache is None:
+            return 0
+        query = """
+            SELECT id, name
+            FROM broker
+            LIMIT %s;
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(query, (limit or self.cache.max_size,))
+                    brokers = cur.fetchall()
+                    self.cache.update(brokers)
+                    logger.info(f"Broker cache warmed with {len(brokers)} brokers")
+                    return len(brokers)
+        except Exception as e:
+            logger.error(f"Error warming broker cache: {str(e)}")
+            raise
+
+    def _remember(self, brokers: List[Optional[Dict[str, Any]]]) -> None:
+        if self.cache is not None:
+            self.cache.update(broker for broker in brokers if broker)
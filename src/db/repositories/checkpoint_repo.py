@@ -0,0 +1,242 @@
+import os
+import json
+import sqlite3
+import threading
+from dotenv import load_dotenv
+from utils.logger import setup_logger
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from typing import List, Dict, Any, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+load_dotenv()
+
+# Setup logger
+logger = setup_logger()
+
+default_dsn = os.getenv("postgresql_dsn")
+
+
+class CrawlCursor:
+    """Committed pages of one crawl key (a region or tile payload name).
+
+    Pages can commit out of order when fetched concurrently, so progress is
+    kept as the highest contiguous committed page plus the pages committed
+    beyond it.
+    """
+
+    def __init__(
+        self,
+        last_page: int = 0,
+        pending: Optional[List[int]] = None,
+        completed: bool = False,
+    ):
+        self.last_page = last_page
+        self.pending = set(pending or ())
+        self.completed = completed
+
+    def is_done(self, page: int) -> bool:
+        return page <= self.last_page or page in self.pending
+
+    def with_page(self, page: int) -> Tuple[int, List[int]]:
+        """Progress as it will be once ``page`` commits, without applying it."""
+        last_page, pending = self.last_page, set(self.pending)
+        pending.add(page)
+        while last_page + 1 in pending:
+            last_page += 1
+            pending.discard(last_page)
+        return last_page, sorted(pending)
+
+    def commit(self, page: int) -> None:
+        self.last_page, pending = self.with_page(page)
+        self.pending = set(pending)
+
+
+@instrument_methods("checkpoint")
+class CheckpointRepository:
+    """Crawl checkpoints stored in PostgreSQL.
+
+    ``save`` accepts the cursor of an open transaction so a checkpoint can be
+    committed atomically with the page data it describes.
+    """
+
+    transactional = True
+
+    def __init__(self, dsn: str = default_dsn, pool: Optional[ConnectionPool] = None):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN."""
+        self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        logger.info("CheckpointRepository initialized")
+
+    def ensure_table(self) -> None:
+        query = """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoint (
+                crawl_key TEXT PRIMARY KEY,
+                last_page INTEGER NOT NULL DEFAULT 0,
+                cursor JSONB NOT NULL DEFAULT '{}'::jsonb,
+                completed BOOLEAN NOT NULL DEFAULT FALSE,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query)
+        except Exception as e:
+            logger.error(f"Error creating checkpoint table: {str(e)}")
+            raise
+
+    def save(
+        self,
+        crawl_key: str,
+        last_page: int,
+        pending: List[int],
+        completed: bool = False,
+        cur=None,
+    ) -> None:
+        """Upsert a checkpoint, on ``cur`` (without committing) if given."""
+        query = """
+            INSERT INTO crawl_checkpoint (crawl_key, last_page, cursor, completed, updated_at)
+            VALUES (%s, %s, %s, %s, now())
+            ON CONFLICT (crawl_key) DO UPDATE
+            SET last_page = EXCLUDED.last_page,
+                cursor = EXCLUDED.cursor,
+                completed = EXCLUDED.completed,
+                updated_at = now();
+        """
+        params = (crawl_key, last_page, json.dumps({"pending": pending}), completed)
+        if cur is not None:
+            cur.execute(query, params)
+            return
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as own_cur:
+                    own_cur.execute(query, params)
+                    conn.commit()
+        except Exception as e:
+            logger.error(f"Error saving checkpoint {crawl_key}: {str(e)}")
+            raise
+
+    def load(self, crawl_key: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint for a crawl key as ``{"last_page", "pending", "completed"}``."""
+        query = """
+            SELECT last_page, cursor, completed
+            FROM crawl_checkpoint
+            WHERE crawl_key = %s;
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(query, (crawl_key,))
+                    row = cur.fetchone()
+                    if row is None:
+                        return None
+                    return {
+                        "last_page": row["last_page"],
+                        "pending": row["cursor"].get("pending", []),
+                        "completed": row["completed"],
+                    }
+        except Exception as e:
+            logger.error(f"Error loading checkpoint {crawl_key}: {str(e)}")
+            raise
+
+    def clear(self, prefix: str = "") -> int:
+        """Delete checkpoints whose key starts with ``prefix``."""
+        query = """
+            DELETE FROM crawl_checkpoint
+            WHERE left(crawl_key, %s) = %s;
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, (len(prefix), prefix))
+                    conn.commit()
+                    return cur.rowcount
+        except Exception as e:
+            logger.error(f"Error clearing checkpoints {prefix}: {str(e)}")
+            raise
+
+
+class SqliteCheckpointRepository:
+    """Crawl checkpoints in a local SQLite file.
+
+    SQLite cannot join the PostgreSQL page transaction, so checkpoints are
+    written right after the page commits; a crash in between re-ingests that
+    page on resume, which the zpid conflict rules turn into skipped rows.
+    """
+
+    transactional = False
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoint (
+                crawl_key TEXT PRIMARY KEY,
+                last_page INTEGER NOT NULL DEFAULT 0,
+                cursor TEXT NOT NULL DEFAULT '{}',
+                completed INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self._conn.commit()
+        logger.info(f"SqliteCheckpointRepository initialized at {path}")
+
+    def ensure_table(self) -> None:
+        pass
+
+    def save(
+        self,
+        crawl_key: str,
+        last_page: int,
+        pending: List[int],
+        completed: bool = False,
+        cur=None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO crawl_checkpoint (crawl_key, last_page, cursor, completed)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (crawl_key) DO UPDATE
+                SET last_page = excluded.last_page,
+                    cursor = excluded.cursor,
+                    completed = excluded.completed,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (
+                    crawl_key,
+                    last_page,
+                    json.dumps({"pending": pending}),
+                    int(completed),
+                ),
+            )
+            self._conn.commit()
+
+    def load(self, crawl_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_page, cursor, completed FROM crawl_checkpoint "
+                "WHERE crawl_key = ?",
+                (crawl_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "last_page": row[0],
+            "pending": json.loads(row[1]).get("pending", []),
+            "completed": bool(row[2]),
+        }
+
+    def clear(self, prefix: str = "") -> int:
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM crawl_checkpoint WHERE substr(crawl_key, 1, ?) = ?",
+                (len(prefix), prefix),
+            ).rowcount
+            self._conn.commit()
+        return deleted
@@ -0,0 +1,220 @@
+import os
+import math
+import threading
+
+from psycopg2.extras import RealDictCursor
+
+from dotenv import load_dotenv
+from utils.logger import setup_logger
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from typing import List, Dict, Any, Optional, Tuple
+
+load_dotenv()
+
+# Setup logger
+logger = setup_logger()
+
+default_dsn = os.getenv("postgresql_dsn")
+
+EARTH_RADIUS_M = 6371008.8
+
+# Must match the index expressions in migrations/005_address_geo_index.sql
+POSTGIS_POINT = "ST_SetSRID(ST_MakePoint(a.longitude, a.latitude), 4326)::geography"
+POSTGIS_CENTER = "ST_SetSRID(ST_MakePoint(%(lon)s, %(lat)s), 4326)::geography"
+EARTH_POINT = "ll_to_earth(a.latitude, a.longitude)"
+EARTH_CENTER = "ll_to_earth(%(lat)s, %(lon)s)"
+
+LISTING_COLUMNS = """
+    h.id AS house_id, h.zpid, h.price, h.status, h.beds, h.baths, h.area,
+    h.type, h.url, a.id AS address_id, a.street, a.city, a.state, a.zipcode,
+    a.latitude, a.longitude
+"""
+
+
+IN_BOX = (
+    "a.latitude BETWEEN %(south)s AND %(north)s "
+    "AND a.longitude BETWEEN %(west)s AND %(east)s"
+)
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in metres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    h = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+
+
+def distance_sql(backend: str) -> str:
+    """Distance in metres from the search centre, as ordered by."""
+    if backend == "postgis":
+        # KNN operator: ORDER BY it walks the GiST index nearest first
+        # instead of sorting every match
+        return f"{POSTGIS_POINT} <-> {POSTGIS_CENTER}"
+    return f"earth_distance({EARTH_POINT}, {EARTH_CENTER})"
+
+
+def radius_sql(backend: str) -> str:
+    """Filter for points within ``%(radius)s`` metres of the centre."""
+    if backend == "postgis":
+        return f"ST_DWithin({POSTGIS_POINT}, {POSTGIS_CENTER}, %(radius)s)"
+    return (
+        f"earth_box({EARTH_CENTER}, %(radius)s) @> {EARTH_POINT} "
+        f"AND {distance_sql(backend)} <= %(radius)s"
+    )
+
+
+def bbox_sql(backend: str) -> str:
+    """Filter for points inside the ``%(south)s``..``%(east)s`` box.
+
+    The earthdistance index answers a cube around ``%(radius)s``, the
+    distance from the centre to the farthest corner; the box test is exact.
+    """
+    if backend == "postgis":
+        envelope = (
+            "ST_MakeEnvelope(%(west)s, %(south)s, %(east)s, %(north)s, 4326)"
+            "::geography"
+        )
+        return f"{POSTGIS_POINT} && {envelope} AND {IN_BOX}"
+    return f"earth_box({EARTH_CENTER}, %(radius)s) @> {EARTH_POINT} AND {IN_BOX}"
+
+
+def search_sql(backend: str, within: str, keyset: bool = False) -> str:
+    """Nearest-first listing query; ``keyset`` adds the ``after`` condition."""
+    distance = distance_sql(backend)
+    after = ""
+    if keyset:
+        after = (
+            f"AND ({distance}, a.id) "
+            "> (%(after_distance)s, %(after_id)s::uuid)"
+        )
+    # Ordered by the expression itself, not an alias, so the planner can
+    # match it to the index
+    return f"""
+        SELECT {LISTING_COLUMNS}, {distance} AS distance_m
+        FROM address a
+        JOIN house h ON h.id = a.house_id
+        WHERE {within}
+        {after}
+        ORDER BY {distance}, a.id
+        LIMIT %(limit)s;
+    """
+
+
+@instrument_methods("geo")
+class GeoSearchRepository:
+    """Radius and bounding-box search over listings, nearest first.
+
+    Uses PostGIS when the extension is installed and cube/earthdistance
+    otherwise; both are served by the GiST index from migration 005, which
+    PostGIS also walks in distance order (KNN) instead of sorting. Results
+    are house + address rows with ``distance_m`` from the search centre and
+    are keyset-paginated: pass ``(distance_m, address_id)`` of the last row
+    of a page as ``after`` to get the next one.
+    """
+
+    def __init__(self, dsn: str = default_dsn, pool: Optional[ConnectionPool] = None):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN."""
+        self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        self._backend: Optional[str] = None
+        self._lock = threading.Lock()
+        logger.info("GeoSearchRepository initialized")
+
+    @property
+    def backend(self) -> str:
+        """``"postgis"`` or ``"earthdistance"``, detected once."""
+        with self._lock:
+            if self._backend is None:
+                query = """
+                    SELECT extname FROM pg_extension
+                    WHERE extname IN ('postgis', 'earthdistance');
+                """
+                with self.pool.connection() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(query)
+                        installed = {row[0] for row in cur.fetchall()}
+                if "postgis" in installed:
+                    self._backend = "postgis"
+                elif "earthdistance" in installed:
+                    self._backend = "earthdistance"
+                else:
+                    raise RuntimeError(
+                        "Geo search needs PostGIS or earthdistance; "
+                        "run migration 005_address_geo_index"
+                    )
+                logger.info(f"Geo search backend: {self._backend}")
+            return self._backend
+
+    def search_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        limit: int = 100,
+        after: Optional[Tuple[float, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Listings within ``radius_m`` metres of a point."""
+        params = {"lat": latitude, "lon": longitude, "radius": radius_m}
+        return self._search(radius_sql(self.backend), params, limit, after)
+
+    def search_bbox(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        limit: int = 100,
+        after: Optional[Tuple[float, Any]] = None,
+        center: Optional[Tuple[float, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Listings inside a latitude/longitude box.
+
+        Sorted by distance from ``center`` (latitude, longitude), which
+        defaults to the middle of the box. Boxes crossing the antimeridian
+        are not supported.
+        """
+        lat, lon = center or ((south + north) / 2, (west + east) / 2)
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "south": south,
+            "west": west,
+            "north": north,
+            "east": east,
+        }
+        if self.backend == "earthdistance":
+            params["radius"] = max(
+                haversine_m(lat, lon, corner_lat, corner_lon)
+                for corner_lat in (south, north)
+                for corner_lon in (west, east)
+            )
+        return self._search(bbox_sql(self.backend), params, limit, after)
+
+    def _search(
+        self,
+        within: str,
+        params: Dict[str, Any],
+        limit: int,
+        after: Optional[Tuple[float, Any]],
+    ) -> List[Dict[str, Any]]:
+        if after is not None:
+            params["after_distance"], params["after_id"] = after[0], str(after[1])
+        params["limit"] = limit
+        query = search_sql(self.backend, within, keyset=after is not None)
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(query, params)
+                    return cur.fetchall()
+        except Exception as e:
+            logger.error(
+                f"Error in geo search around {params['lat']}, {params['lon']}: "
+                f"{str(e)}"
+            )
+            raise
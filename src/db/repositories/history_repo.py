@@ -0,0 +1,235 @@
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+from dotenv import load_dotenv
+from utils.logger import setup_logger
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from typing import List, Dict, Any, Optional, Set
+
+load_dotenv()
+
+# Setup logger
+logger = setup_logger()
+
+default_dsn = os.getenv("postgresql_dsn")
+
+PARTITION_PREFIX = "house_history_p"
+
+# Look-back of price_trajectory when no ``since`` is given, so it reads a
+# bounded set of monthly partitions instead of all of them
+TRAJECTORY_WINDOW = timedelta(days=365)
+
+
+def month_start(moment: datetime) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month.year:04d}{month.month:02d}"
+
+
+@instrument_methods("house_history")
+class HouseHistoryRepository:
+    """Append-only price/status history, range-partitioned by month.
+
+    A row is written when a house is first seen and whenever its price or
+    status differs from the current ``house`` row, so ``record_changes`` must
+    run before the house upsert in the same transaction. Queries bound
+    ``observed_at`` with literals so the planner prunes to the partitions
+    they cover, and old months can be detached without touching the rest.
+    """
+
+    def __init__(self, dsn: str = default_dsn, pool: Optional[ConnectionPool] = None):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN."""
+        self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        self._months: Set[date] = set()
+        self._lock = threading.Lock()
+        logger.info("HouseHistoryRepository initialized")
+
+    def ensure_table(self, months_ahead: int = 1) -> None:
+        """Create the partitioned table and partitions up to ``months_ahead``."""
+        query = """
+            CREATE TABLE IF NOT EXISTS house_history (
+                zpid TEXT NOT NULL,
+                house_id UUID NOT NULL,
+                price NUMERIC,
+                status TEXT,
+                observed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            ) PARTITION BY RANGE (observed_at);
+            CREATE INDEX IF NOT EXISTS idx_house_history_zpid
+                ON house_history (zpid, observed_at);
+            CREATE INDEX IF NOT EXISTS idx_house_history_house_id
+                ON house_history (house_id, observed_at);
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query)
+        except Exception as e:
+            logger.error(f"Error creating house_history table: {str(e)}")
+            raise
+        month = month_start(datetime.now(timezone.utc))
+        for _ in range(months_ahead + 1):
+            self.ensure_partition(month)
+            month = next_month(month)
+
+    def ensure_partition(self, month: date) -> None:
+        """Create the partition holding ``month`` unless it is known to exist.
+
+        Runs on its own connection: creating a partition locks the parent
+        table, which a page transaction should not hold.
+        """
+        with self._lock:
+            if month in self._months:
+                return
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {partition_name(month)}
+            PARTITION OF house_history
+            FOR VALUES FROM (%s) TO (%s);
+        """
+        bounds = (f"{month} 00:00:00+00", f"{next_month(month)} 00:00:00+00")
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, bounds)
+        except Exception as e:
+            logger.error(f"Error creating partition for {month}: {str(e)}")
+            raise
+        with self._lock:
+            self._months.add(month)
+
+    def record_changes(self, cur, house_data: List[List[Any]]) -> int:
+        """Append history rows for new houses and price/status changes.
+
+        Runs on a caller-owned cursor without committing, before the house
+        rows are upserted. Returns the number of history rows written.
+        """
+        query = """
+            INSERT INTO house_history (zpid, house_id, price, status, observed_at)
+            SELECT v.zpid, COALESCE(h.id, v.id), v.price, v.status, now()
+            FROM (VALUES %s) AS v (id, zpid, price, status)
+            LEFT JOIN house h ON h.zpid = v.zpid
+            WHERE h.id IS NULL
+               OR h.price IS DISTINCT FROM v.price
+               OR h.status IS DISTINCT FROM v.status;
+        """
+        if not house_data:
+            return 0
+
+        # The transaction's now() may fall just past a month boundary
+        month = month_start(datetime.now(timezone.utc))
+        self.ensure_partition(month)
+        self.ensure_partition(next_month(month))
+
+        # Same last-listing-wins rule as the house upsert
+        latest = {str(row[1]): row for row in house_data}
+        values = [
+            (str(row[0]), zpid, row[2], row[3]) for zpid, row in latest.items()
+        ]
+        execute_values(
+            cur,
+            query,
+            values,
+            template="(%s::uuid, %s::text, %s::numeric, %s::text)",
+        )
+        return cur.rowcount
+
+    def price_trajectory(
+        self,
+        zpid: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Price and status observations of one listing, oldest first.
+
+        ``since`` defaults to ``TRAJECTORY_WINDOW`` before ``until`` (or now);
+        pass an explicit older ``since`` to read further back.
+        """
+        if since is None:
+            since = (until or datetime.now(timezone.utc)) - TRAJECTORY_WINDOW
+        conditions = ["zpid = %s", "observed_at >= %s"]
+        params: List[Any] = [str(zpid), since]
+        if until is not None:
+            conditions.append("observed_at < %s")
+            params.append(until)
+        query = f"""
+            SELECT observed_at, price, status
+            FROM house_history
+            WHERE {" AND ".join(conditions)}
+            ORDER BY observed_at;
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(query, params)
+                    return cur.fetchall()
+        except Exception as e:
+            logger.error(f"Error loading price trajectory for {zpid}: {str(e)}")
+            raise
+
+    def changes_in_zipcode(
+        self, zipcode: str, since: datetime, until: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Every history row since ``since`` for houses in a zipcode."""
+        query = f"""
+            SELECT hh.zpid, hh.house_id, hh.price, hh.status, hh.observed_at
+            FROM house_history hh
+            JOIN address a ON a.house_id = hh.house_id
+            WHERE a.zipcode = %s
+              AND hh.observed_at >= %s
+              {"AND hh.observed_at < %s" if until is not None else ""}
+            ORDER BY hh.observed_at;
+        """
+        params = [zipcode, since] + ([until] if until is not None else [])
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(query, params)
+                    return cur.fetchall()
+        except Exception as e:
+            logger.error(f"Error loading history for zipcode {zipcode}: {str(e)}")
+            raise
+
+    def detach_before(self, cutoff: datetime) -> List[str]:
+        """Detach monthly partitions that end on or before ``cutoff``.
+
+        Detached tables are kept so they can be archived or dropped later.
+        """
+        query = """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = 'house_history';
+        """
+        keep_from = partition_name(month_start(cutoff))
+        detached = []
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query)
+                    # Names sort by month, e.g. house_history_p202401
+                    for (name,) in cur.fetchall():
+                        if name.startswith(PARTITION_PREFIX) and name < keep_from:
+                            cur.execute(
+                                f"ALTER TABLE house_history DETACH PARTITION {name};"
+                            )
+                            detached.append(name)
+        except Exception as e:
+            logger.error(f"Error detaching history partitions: {str(e)}")
+            raise
+        with self._lock:
+            self._months = {m for m in self._months if partition_name(m) >= keep_from}
+        logger.info(f"Detached history partitions: {detached}")
+        return detached
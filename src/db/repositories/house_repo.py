@@ -1,5 +1,6 @@
 import os
 import uuid
+import hashlib
 import logging
 
 import psycopg2
@@ -7,6 +8,9 @@ from psycopg2.extras import RealDictCursor, execute_values
 
 from dotenv import load_dotenv
 from utils.logger import setup_logger
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from db.rows import House, row_cursor
 from typing import List, Dict, Any, Optional, Union
 
 load_dotenv()
@@ -20,10 +24,41 @@ default_dsn = os.getenv("postgresql_dsn")
 psycopg2.extras.register_uuid()
 
 
+def _hash_part(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{float(value):.2f}"
+    return str(value)
+
+
+def content_hash(house_row) -> str:
+    """Hash of the fields whose change should rewrite a house row.
+
+    Covers price, status, beds, baths, area and url of a
+    [id, zpid, price, status, beds, baths, area, type, url, ...] row.
+    """
+    parts = (house_row[2], house_row[3], house_row[4], house_row[5], house_row[6])
+    content = "|".join(_hash_part(value) for value in parts + (house_row[8],))
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+@instrument_methods("house")
 class HouseRepository:
-    def __init__(self, dsn: str = default_dsn):
-        """Initialize database connection with a DSN (Data Source Name)."""
+    def __init__(
+        self,
+        dsn: str = default_dsn,
+        pool: Optional[ConnectionPool] = None,
+        compact_rows: bool = False,
+    ):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN.
+
+        With ``compact_rows``, bulk_create returns House namedtuples
+        (db.rows) instead of dicts.
+        """
         self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        self.row_cursor = row_cursor(House) if compact_rows else RealDictCursor
         logger.info("HouseRepository initialized")
 
     def create(self, house_data: List[Any]) -> Union[Optional[Dict[str, Any]], None]:
@@ -38,7 +73,7 @@ class HouseRepository:
             RETURNING id, zpid, price, status, beds, baths, area, type, url, broker_id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Format the data
                     id, zpid, price, status, beds, baths, area, type, url, broker_id = (
@@ -74,6 +109,31 @@ class HouseRepository:
             logger.error(f"Error creating house: {str(e)}", exc_info=True)
             raise
 
+    @staticmethod
+    def _format_values(house_data: List[List[Any]]) -> List[tuple]:
+        """Convert UUIDs to strings and handle None values for batch inserts."""
+        return [
+            (
+                (
+                    str(row[0]) if isinstance(row[0], uuid.UUID) else row[0]
+                ),  # Ensure UUID as str
+                row[1],  # zpid (required)
+                row[2],  # price (default 0)
+                row[3],  # status (required)
+                row[4],  # beds (default 0)
+                row[5],  # baths (default 0)
+                row[6],  # area (nullable)
+                row[7],  # type (required)
+                row[8] if row[8] is not None else None,  # url (nullable)
+                (
+                    str(row[9])
+                    if row[9] is not None and isinstance(row[9], uuid.UUID)
+                    else row[9]
+                ),  # broker_id (nullable)
+            )
+            for row in house_data
+        ]
+
     def bulk_create(self, house_data: List[List[Any]]) -> List[Dict[str, Any]]:
         """Bulk insert houses while handling UUIDs and formatting values correctly."""
         query = """
@@ -84,36 +144,15 @@ class HouseRepository:
         """
 
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    # Convert UUIDs to strings and handle None values
-                    formatted_values = [
-                        (
-                            (
-                                str(row[0]) if isinstance(row[0], uuid.UUID) else row[0]
-                            ),  # Ensure UUID as str
-                            row[1],  # zpid (required)
-                            row[2],  # price (default 0)
-                            row[3],  # status (required)
-                            row[4],  # beds (default 0)
-                            row[5],  # baths (default 0)
-                            row[6],  # area (nullable)
-                            row[7],  # type (required)
-                            row[8] if row[8] is not None else None,  # url (nullable)
-                            (
-                                str(row[9])
-                                if row[9] is not None and isinstance(row[9], uuid.UUID)
-                                else None
-                            ),  # broker_id (nullable)
-                        )
-                        for row in house_data
-                    ]
-
-                    # Execute batch insert
-                    execute_values(cur, query, formatted_values)
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
+                    formatted_values = self._format_values(house_data)
 
+                    # Execute batch insert, collecting RETURNING rows of every page
+                    inserted_rows = execute_values(
+                        cur, query, formatted_values, fetch=True
+                    )
                     conn.commit()
-                    inserted_rows = cur.fetchall()
                     logger.info(
                         f"Successfully bulk inserted {len(inserted_rows)} houses"
                     )
@@ -122,3 +161,100 @@ class HouseRepository:
         except Exception as e:
             logger.error(f"Error bulk inserting houses: {str(e)}", exc_info=True)
             raise
+
+    def existing_ids(self, cur, house_ids: List[Any]) -> set:
+        """Subset of ``house_ids`` (as strings) present in the house table."""
+        if not house_ids:
+            return set()
+        cur.execute(
+            "SELECT id FROM house WHERE id = ANY(%s::uuid[])",
+            ([str(house_id) for house_id in house_ids],),
+        )
+        return {str(row["id"]) for row in cur.fetchall()}
+
+    def insert_batch(self, cur, house_data: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Insert houses on a caller-owned cursor without committing.
+
+        Used by batched ingestion so a page of houses and their children share
+        one transaction. Only rows that were actually inserted are returned;
+        houses skipped on a zpid conflict are absent from the result.
+        """
+        query = """
+            INSERT INTO house (id, zpid, price, status, beds, baths, area, type, url, broker_id)
+            VALUES %s
+            ON CONFLICT (zpid) DO NOTHING
+            RETURNING id, zpid;
+        """
+        if not house_data:
+            return []
+        return execute_values(
+            cur, query, self._format_values(house_data), fetch=True
+        )
+
+    def upsert_batch(self, cur, house_data: List[List[Any]]) -> Dict[str, Any]:
+        """Insert new houses and update only those whose content changed.
+
+        Runs on a caller-owned cursor without committing. Rows are compared by
+        content_hash, so unchanged listings cause no write at all. Returns the
+        ids of new rows, the zpid -> id map of changed rows, the count of
+        unchanged rows and of in-batch duplicates of a zpid.
+        """
+        query = """
+            INSERT INTO house (id, zpid, price, status, beds, baths, area, type, url, broker_id, content_hash)
+            VALUES %s
+            ON CONFLICT (zpid) DO UPDATE
+            SET price = EXCLUDED.price,
+                status = EXCLUDED.status,
+                beds = EXCLUDED.beds,
+                baths = EXCLUDED.baths,
+                area = EXCLUDED.area,
+                type = EXCLUDED.type,
+                url = EXCLUDED.url,
+                broker_id = EXCLUDED.broker_id,
+                content_hash = EXCLUDED.content_hash
+            WHERE house.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING id, zpid, (xmax = 0) AS inserted;
+        """
+        result = {"inserted": [], "changed": {}, "unchanged": 0, "duplicates": 0}
+        if not house_data:
+            return result
+
+        # ON CONFLICT DO UPDATE cannot touch a row twice; last listing wins
+        latest = {str(row[1]): row for row in house_data}
+        values = [
+            formatted + (content_hash(row),)
+            for row, formatted in zip(
+                latest.values(), self._format_values(list(latest.values()))
+            )
+        ]
+        rows = execute_values(cur, query, values, fetch=True)
+        for row in rows:
+            if row["inserted"]:
+                result["inserted"].append(row)
+            else:
+                result["changed"][str(row["zpid"])] = row["id"]
+        result["unchanged"] = len(latest) - len(rows)
+        result["duplicates"] = len(house_data) - len(latest)
+        return result
+
+    def upsert_changed(self, house_data: List[List[Any]]) -> Dict[str, int]:
+        """Change-detecting upsert in its own transaction.
+
+        Returns counts of new, changed, unchanged and duplicate rows.
+        """
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    result = self.upsert_batch(cur, house_data)
+                    conn.commit()
+            counts = {
+                "new": len(result["inserted"]),
+                "changed": len(result["changed"]),
+                "unchanged": result["unchanged"],
+                "duplicates": result["duplicates"],
+            }
+            logger.info(f"Upserted houses: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"Error upserting houses: {str(e)}", exc_info=True)
+            raise
@@ -1,8 +1,11 @@
 import os
 import uuid
 from dotenv import load_dotenv
-from utils.logger import setup_logger
-from typing import List, Dict, Any, Optional
+from utils.logger import get_item_logger, setup_logger
+from utils.metrics import instrument_methods
+from db.pool import ConnectionPool, get_pool
+from db.rows import Image, row_cursor
+from typing import List, Dict, Any, Iterator, Optional
 
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
@@ -11,14 +14,27 @@ load_dotenv()
 
 # Setup logger
 logger = setup_logger()
+item_logger = get_item_logger()
 
 default_dsn = os.getenv("postgresql_dsn")
 
 
+@instrument_methods("images")
 class ImagesRepository:
-    def __init__(self, dsn: str = default_dsn):
-        """Initialize database connection with a DSN (Data Source Name)."""
+    def __init__(
+        self,
+        dsn: str = default_dsn,
+        pool: Optional[ConnectionPool] = None,
+        compact_rows: bool = False,
+    ):
+        """Initialize with a shared connection pool, or the process-wide pool for the DSN.
+
+        With ``compact_rows``, bulk_create and the get/iter by house methods
+        return Image namedtuples (db.rows) instead of dicts.
+        """
         self.dsn = dsn
+        self.pool = pool or get_pool(dsn)
+        self.row_cursor = row_cursor(Image) if compact_rows else RealDictCursor
         logger.info("ImagesRepository initialized")
 
     def create(self, house_id: str, url: str) -> Optional[Dict[str, Any]]:
@@ -28,9 +44,9 @@ class ImagesRepository:
             VALUES (%s, %s, %s)
             RETURNING id, house_id, url;
         """
-        logger.info(f"Creating image for house {house_id} with url {url}")
+        item_logger.debug("Creating image for house %s with url %s", house_id, url)
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     image_id = str(uuid.uuid4())
                     cur.execute(query, (image_id, house_id, url))
@@ -52,20 +68,36 @@ class ImagesRepository:
         """
         logger.info(f"Inserting {len(images)} images")
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     # Generate UUIDs and create values tuples
                     values = [
                         (str(id), str(house_id), url) for id, house_id, url in images
                     ]
-                    execute_values(cur, query, values)
+                    rows = execute_values(cur, query, values, fetch=True)
                     conn.commit()
                     logger.info(f"Inserted {len(values)} images")
-                    return cur.fetchall()
+                    return rows
         except Exception as e:
             logger.error(f"Error bulk creating images: {str(e)}")
             raise
 
+    def insert_batch(self, cur, images: List[List[Any]]) -> int:
+        """Insert images on a caller-owned cursor without committing.
+
+        Returns the number of rows inserted.
+        """
+        query = """
+            INSERT INTO images (id, house_id, image_url)
+            VALUES %s
+            ON CONFLICT (id) DO NOTHING
+            RETURNING id;
+        """
+        if not images:
+            return 0
+        values = [(str(id), str(house_id), url) for id, house_id, url in images]
+        return len(execute_values(cur, query, values, fetch=True))
+
     def get_by_house_id(self, house_id: str) -> List[Dict[str, Any]]:
         """Get all images for a specific house."""
         query = """
@@ -75,14 +107,53 @@ class ImagesRepository:
             ORDER BY id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
                     cur.execute(query, (house_id,))
                     return cur.fetchall()
         except Exception as e:
             logger.error(f"Error getting images for house {house_id}: {str(e)}")
             raise
 
+    def get_by_house_id_page(
+        self, house_id: str, after_id: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Keyset-paginated images of a house, ordered by id.
+
+        Pass the last id of the previous page as ``after_id``.
+        """
+        query = f"""
+            SELECT id, house_id, url
+            FROM house_images
+            WHERE house_id = %s
+            {"AND id > %s" if after_id is not None else ""}
+            ORDER BY id
+            LIMIT %s;
+        """
+        params = [house_id] + ([str(after_id)] if after_id is not None else [])
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(cursor_factory=self.row_cursor) as cur:
+                    cur.execute(query, params + [limit])
+                    return cur.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting images for house {house_id}: {str(e)}")
+            raise
+
+    def iter_by_house_id(
+        self, house_id: str, itersize: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the images of a house from a server-side cursor."""
+        query = """
+            SELECT id, house_id, url
+            FROM house_images
+            WHERE house_id = %s
+            ORDER BY id;
+        """
+        return self.pool.stream(
+            query, (house_id,), itersize=itersize, cursor_factory=self.row_cursor
+        )
+
     def delete_by_house_id(self, house_id: str) -> List[str]:
         """Delete all images for a specific house."""
         query = """
@@ -91,7 +162,7 @@ class ImagesRepository:
             RETURNING id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (house_id,))
                     conn.commit()
@@ -108,7 +179,7 @@ class ImagesRepository:
             RETURNING id;
         """
         try:
-            with psycopg2.connect(self.dsn) as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(query, (image_id,))
                     conn.commit()
@@ -0,0 +1,56 @@
+from collections import namedtuple
+
+from psycopg2 import extensions
+
+from typing import Any, Dict, Type
+
+# Compact per-table rows, an alternative to RealDictCursor dicts for bulk
+# reads. Fields follow the column order the repositories SELECT / RETURN;
+# trailing fields default to None for queries that omit them.
+House = namedtuple(
+    "House",
+    ["id", "zpid", "price", "status", "beds", "baths", "area", "type", "url", "broker_id"],
+    defaults=(None,),
+)
+Address = namedtuple(
+    "Address",
+    ["id", "street", "city", "state", "zipcode", "latitude", "longitude", "house_id"],
+    defaults=(None,),
+)
+Broker = namedtuple("Broker", ["id", "name"])
+Image = namedtuple("Image", ["id", "house_id", "url"])
+
+_cursor_classes: Dict[type, Type[extensions.cursor]] = {}
+
+
+def row_cursor(row_type: type) -> Type[extensions.cursor]:
+    """Cursor class (for ``cursor_factory``) that returns ``row_type`` rows.
+
+    Rows are built positionally from plain tuples, so no per-row dict or
+    column-name lookup is allocated. Works for named (server-side) cursors.
+    """
+    cursor_class = _cursor_classes.get(row_type)
+    if cursor_class is not None:
+        return cursor_class
+
+    def make(row: tuple) -> Any:
+        return row_type(*row)
+
+    class RowCursor(extensions.cursor):
+        def fetchone(self):
+            row = super().fetchone()
+            return None if row is None else make(row)
+
+        def fetchmany(self, size=None):
+            rows = super().fetchmany() if size is None else super().fetchmany(size)
+            return [make(row) for row in rows]
+
+        def fetchall(self):
+            return [make(row) for row in super().fetchall()]
+
+        def __iter__(self):
+            return map(make, super().__iter__())
+
+    RowCursor.__name__ = f"{row_type.__name__}Cursor"
+    _cursor_classes[row_type] = RowCursor
+    return RowCursor
@@ -0,0 +1,53 @@
+"""Fetch error classification of ZillowScraper against a local server.
+
+Run from src/: python -m pytest tests
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.retry import RetryableFetchError
+from zillow_scraper import ZillowScraper
+
+
+class TruncatedBodyHandler(BaseHTTPRequestHandler):
+    """Promises a 1000-byte body, sends a few bytes and hangs up."""
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        self.wfile.write(b'{"cat1": {"sea')
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def truncating_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TruncatedBodyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("stream_json", [False, True])
+def test_truncated_body_is_retryable(truncating_url, stream_json):
+    scraper = ZillowScraper(url=truncating_url, max_attempts=2, stream_json=stream_json)
+    scraper.retry_policy.base_delay = 0.0
+    try:
+        with pytest.raises(RetryableFetchError):
+            scraper.request_page(1, scraper.region)
+        # fetch_page retries, then raises what crawl_region treats as a failed page
+        with pytest.raises(RetryableFetchError):
+            scraper.fetch_page(1)
+        assert scraper.retry_policy.stats()["retries"] == 1
+    finally:
+        scraper.close()
@@ -0,0 +1,108 @@
+"""Chunk-boundary regression tests for utils.json_stream.iter_items.
+
+Run from src/: python -m pytest tests
+"""
+import json
+
+import pytest
+
+from utils.json_stream import iter_items
+
+ITEMS = [
+    {"zpid": "1", "price": 1250000, "area": 1234.5, "beds": None, "sold": False},
+    {"zpid": "2", "address": 'Apt "B", 12 [Main] St {rear}', "note": "a\\b\nc"},
+    {"zpid": "3", "city": "San José", "tags": ["café", "日本", "🏠"], "n": -1e-7},
+    [1, [2, [3, {"deep": {}}]], []],
+    "plain string",
+    1234567890123,
+    True,
+]
+DOCUMENT = {
+    "user": {"quirks": "x}]\"{[", "ids": [1, 2, 3]},
+    "cat1": {
+        "searchResults": {
+            "mapResults": [{"zpid": str(i), "ll": [37.7, -122.4]} for i in range(5)],
+            "listResults": ITEMS,
+        },
+        "searchList": {"totalResultCount": 7},
+    },
+    "cat2": {"searchResults": {"listResults": [{"zpid": "other"}]}},
+}
+BODY = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+
+
+def split(body: bytes, size: int):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1000, len(BODY)])
+def test_fixed_chunk_sizes(size):
+    assert list(iter_items(split(BODY, size))) == ITEMS
+
+
+def test_every_two_chunk_split():
+    for cut in range(len(BODY) + 1):
+        assert list(iter_items([BODY[:cut], BODY[cut:]])) == ITEMS, cut
+
+
+def test_numbers_split_between_chunks():
+    body = b'{"cat1": {"searchResults": {"listResults": [12345, 6.25e3, -7]}}}'
+    for cut in range(len(body) + 1):
+        assert list(iter_items([body[:cut], body[cut:]])) == [12345, 6250.0, -7]
+
+
+def test_item_larger_than_decode_window():
+    items = [{"zpid": str(i), "blob": "x" * 40000, "n": i} for i in range(3)]
+    body = json.dumps({"cat1": {"searchResults": {"listResults": items}}}).encode()
+    assert list(iter_items(split(body, 4096))) == items
+
+
+def test_consumes_whole_body():
+    chunks = split(BODY, 16)
+    iterator = iter(chunks)
+    assert list(iter_items(iterator)) == ITEMS
+    assert next(iterator, None) is None
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"{}",
+        b'{"error": "blocked"}',
+        b'{"cat1": {}}',
+        b'{"cat1": {"searchResults": null}, "cat2": [1, {"a": "}"}]}',
+        b'{"cat1": {"searchResults": {"listResults": {"zpid": "1"}}}}',
+    ],
+)
+def test_missing_path_yields_nothing(body):
+    assert list(iter_items(split(body, 1))) == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"<html><body>Please verify you are a human</body></html>",
+        b"[]",
+        b"null",
+        b'"cat1"',
+        b"",
+        b'{"error": "blocked"',
+        b'{"cat1": {}} <html>',
+        b'{"cat1": {"searchResults": {"listResults": []}, "searchList": {"tot',
+    ],
+)
+def test_non_object_or_malformed_body_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_items(split(body, 3)))
+
+
+def test_empty_list():
+    body = b'{"cat1": {"searchResults": {"listResults": [ ]}}}'
+    assert list(iter_items(split(body, 1))) == []
+
+
+@pytest.mark.parametrize("size", [1, 5, 64])
+def test_truncated_body_raises(size):
+    body = BODY[: BODY.index(b'"plain string"') + 5]
+    with pytest.raises(ValueError):
+        list(iter_items(split(body, size)))
@@ -0,0 +1,48 @@
+"""Region completion and --resume against the local stand-in server.
+
+Pages are "persisted" by a stub that only checkpoints them, so no
+database is needed. Run from src/: python -m pytest tests
+"""
+import pytest
+
+from benchmarks.standin_server import StandInServer
+from db.repositories.checkpoint_repo import SqliteCheckpointRepository
+from zillow_scraper import ZillowScraper
+
+
+@pytest.fixture
+def server():
+    with StandInServer(pages=5, page_size=3) as server:
+        yield server
+
+
+def crawl(server, checkpoints, mode, max_pages):
+    """Crawl with resume on; returns the requests it sent."""
+    scraper = ZillowScraper(
+        url=server.url, rate=1000.0, checkpoints=checkpoints, resume=True
+    )
+    scraper.handle_page = lambda page, houses, region=None, parsed=None: (
+        scraper.save_checkpoint(region or scraper.region, page) or True
+    )
+    before = server.counts["requests"]
+    try:
+        if mode == "async":
+            scraper.scrape_async(max_pages, concurrency=2)
+        else:
+            scraper.scrape(max_pages)
+    finally:
+        scraper.close()
+    return server.counts["requests"] - before
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_page_limit_does_not_complete_region(server, tmp_path, mode):
+    checkpoints = SqliteCheckpointRepository(str(tmp_path / "checkpoints.db"))
+    assert crawl(server, checkpoints, mode, 3) == 3
+    assert not checkpoints.load("california")["completed"]
+
+    # Resumes after page 3 and stops at the first empty page (6)
+    assert crawl(server, checkpoints, mode, 10) >= 3
+    assert checkpoints.load("california")["completed"]
+
+    assert crawl(server, checkpoints, mode, 10) == 0
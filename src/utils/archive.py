@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import zlib
+import threading
+from datetime import datetime, timezone
+
+from utils.logger import setup_logger
+from utils.json_stream import loads
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+# Setup logger
+logger = setup_logger()
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX = ".idx"
+
+
+def _compress(data: bytes, level: int) -> bytes:
+    # One complete gzip member per record: concatenated members are still a
+    # valid .gz file, and each can be decompressed on its own from the index
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ResponseArchive:
+    """Append-only store of raw search responses in gzip segment files.
+
+    Each record is one JSON line ``{"region", "page", "fetched_at",
+    "response"}`` compressed as its own gzip member, so a segment reads with
+    ``zcat`` and a record can be fetched by offset. A sidecar ``.idx`` file
+    lists ``offset length region page`` per record. Segments roll over at
+    ``segment_bytes`` and are never rewritten; names carry the start time
+    and pid, so several writers can share a directory.
+    """
+
+    def __init__(
+        self, directory: str, segment_bytes: int = 64 * 2**20, level: int = 6
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.level = level
+        self._lock = threading.Lock()
+        self._segment: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._sequence = 0
+        self.records = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_segment(self) -> None:
+        self._sequence += 1
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}-{os.getpid()}-{self._sequence:04d}"
+        path = os.path.join(self.directory, name + SEGMENT_SUFFIX)
+        self._segment = open(path, "ab")
+        self._index = open(os.path.join(self.directory, name + INDEX_SUFFIX), "ab")
+        logger.info(f"Archiving responses to {path}")
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+            self._segment = self._index = None
+
+    def append(self, region: str, page: int, body: bytes) -> None:
+        """Archive one raw response body, which must be a JSON document."""
+        header = json.dumps(
+            {"region": region, "page": page, "fetched_at": time.time()}
+        ).encode()
+        # Splice the body in as-is rather than decoding and re-encoding it
+        record = _compress(header[:-1] + b', "response": ' + body + b"}\n", self.level)
+        with self._lock:
+            if self._segment is None or self._segment.tell() >= self.segment_bytes:
+                self._close_segment()
+                self._open_segment()
+            offset = self._segment.tell()
+            self._segment.write(record)
+            self._segment.flush()
+            # Index after the data, so every indexed record is complete
+            self._index.write(
+                f"{offset} {len(record)} {json.dumps(region)} {page}\n".encode()
+            )
+            self._index.flush()
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+
+def list_segments(directory: str) -> List[str]:
+    """Segment paths in a directory, oldest first."""
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith(SEGMENT_SUFFIX)
+    ]
+
+
+def read_record(path: str, offset: int, length: int) -> Dict[str, Any]:
+    """Decode the single record stored at ``offset`` in a segment."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return loads(zlib.decompress(f.read(length), 31))
+
+
+def iter_segment(path: str, chunk_size: int = 2**20) -> Iterator[Dict[str, Any]]:
+    """Stream a segment's records in order, without loading it whole.
+
+    Reads the data file rather than the index, so records written after the
+    last index entry are still returned; a truncated final record (e.g. from
+    a crash mid-write) is logged and skipped.
+    """
+    decompressor = zlib.decompressobj(31)
+    member: List[bytes] = []
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            while chunk:
+                member.append(decompressor.decompress(chunk))
+                if not decompressor.eof:
+                    break
+                # One gzip member per record; the rest of the chunk is the next
+                chunk = decompressor.unused_data
+                yield loads(b"".join(member))
+                member = []
+                decompressor = zlib.decompressobj(31)
+    if member:
+        logger.warning(f"Skipping truncated record at the end of {path}")
+
+
+def iter_archive(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Records from several segments (or archive directories), in order."""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_archive(list_segments(path))
+        else:
+            yield from iter_segment(path)
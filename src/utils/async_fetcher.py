@@ -0,0 +1,98 @@
+import asyncio
+from utils.logger import setup_logger
+from utils.rate_limiter import TokenBucket
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Setup logger
+logger = setup_logger()
+
+# Queue marker telling the DB stage that all fetchers are done
+_DONE = object()
+
+
+class AsyncFetchEngine:
+    """Keep up to ``concurrency`` page fetches in flight and feed a DB stage.
+
+    Fetching is done by a blocking ``fetch(page)`` callable running in worker
+    threads, paced by a token bucket. Results pass through a bounded queue to
+    a single ``handle(page, houses)`` consumer, so fetchers pause when the DB
+    stage falls behind and memory stays flat. After ``run``, ``exhausted``
+    tells whether an empty page was seen and ``failed`` counts pages whose
+    fetch or handling raised.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        rate: float = 0.5,
+        burst: float = 1.0,
+        queue_size: int = 8,
+        limiter: Optional[TokenBucket] = None,
+    ):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.limiter = limiter or TokenBucket(rate, burst)
+        self.exhausted = False
+        self.failed = 0
+
+    async def run(
+        self,
+        pages: Iterable[int],
+        fetch: Callable[[int], List[Dict[str, Any]]],
+        handle: Callable[[int, List[Dict[str, Any]]], None],
+    ) -> int:
+        """Fetch ``pages`` and hand each non-empty result to ``handle``.
+
+        No new pages are scheduled once a fetch returns no listings; fetches
+        already in flight still complete. Returns the number of pages handled.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        page_iter = iter(pages)
+        stopped = asyncio.Event()
+        self.exhausted = False
+        self.failed = 0
+
+        async def fetcher() -> None:
+            while not stopped.is_set():
+                page = next(page_iter, None)
+                if page is None:
+                    return
+                await self.limiter.acquire_async()
+                if stopped.is_set():
+                    return
+                try:
+                    houses = await asyncio.to_thread(fetch, page)
+                except Exception as e:
+                    # A failed page is skipped; it does not end the crawl
+                    logger.error(f"Skipping page {page}: {str(e)}")
+                    self.failed += 1
+                    continue
+                if not houses:
+                    logger.warning(f"No data found on page {page}, stopping...")
+                    self.exhausted = True
+                    stopped.set()
+                    return
+                await queue.put((page, houses))
+
+        async def consumer() -> int:
+            handled = 0
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return handled
+                page, houses = item
+                try:
+                    await asyncio.to_thread(handle, page, houses)
+                    handled += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(
+                        f"Error handling page {page}: {str(e)}", exc_info=True
+                    )
+
+        consumer_task = asyncio.create_task(consumer())
+        try:
+            await asyncio.gather(*(fetcher() for _ in range(self.concurrency)))
+        finally:
+            await queue.put(_DONE)
+        return await consumer_task
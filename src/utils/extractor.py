@@ -0,0 +1,194 @@
+import uuid
+import random
+from collections import namedtuple
+
+from utils.logger import get_item_logger, setup_logger
+from utils.ids import address_uuid, house_uuid, image_uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Setup logger
+logger = setup_logger()
+item_logger = get_item_logger()
+
+# A field is read from the first of ``paths`` that yields a usable value; with
+# ``truthy`` a falsy value falls through to the next path (like ``a or b``),
+# otherwise any present key wins (like ``dict.get(key, default)``). ``default``
+# may be a callable, and ``coerce`` converts the chosen value.
+Field = namedtuple("Field", ["name", "paths", "coerce", "default", "truthy"])
+Field.__new__.__defaults__ = (None, None, False)
+
+
+class InvalidValue(ValueError):
+    """A required field could not be coerced; the listing is skipped."""
+
+
+_MISSING = object()
+
+
+def _random_zpid() -> str:
+    # 9 digit number as string
+    return str(random.randint(100000000, 999999999))
+
+
+def _price(value: Any) -> Any:
+    if isinstance(value, str):
+        digits = "".join(filter(str.isdigit, value))
+        if not digits:
+            raise InvalidValue(f"Could not parse price value: {value}")
+        return float(digits)
+    if value is None:
+        return 0
+    return value
+
+
+def _area(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _count(value: Any) -> int:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+HOME_INFO = ("hdpData", "homeInfo")
+
+# Same sources and fallbacks as Parser.parse_house_data, minus the id
+HOUSE_FIELDS = (
+    Field("zpid", [("id",), ("zpid",)], default=_random_zpid, truthy=True),
+    Field("price", [("unformattedPrice",)], coerce=_price),
+    Field("status", [("statusType",)], default="STATUS_TYPE_UNKNOWN"),
+    Field("beds", [("beds",), HOME_INFO + ("beds",)], _count, 0, True),
+    Field("baths", [("baths",), HOME_INFO + ("baths",)], _count, 0, True),
+    Field("area", [HOME_INFO + ("livingArea",)], coerce=_area, default=0),
+    Field("type", [HOME_INFO + ("homeType",)]),
+    Field("url", [("detailUrl",)]),
+)
+
+# Same sources and fallbacks as Parser.parse_address_data, minus the ids
+ADDRESS_FIELDS = (
+    Field("street", [HOME_INFO + ("streetAddress",)]),
+    Field("city", [HOME_INFO + ("city",)]),
+    Field("state", [HOME_INFO + ("state",)]),
+    Field("zipcode", [("zipcode",), HOME_INFO + ("zipcode",)], truthy=True),
+    Field(
+        "latitude",
+        [("latLong", "latitude"), HOME_INFO + ("latitude",)],
+        truthy=True,
+    ),
+    Field(
+        "longitude",
+        [("latLong", "longitude"), HOME_INFO + ("longitude",)],
+        truthy=True,
+    ),
+)
+
+
+def compile_fields(fields: Sequence[Field]) -> Callable[[Dict[str, Any]], tuple]:
+    """Compile a field spec into one function returning a tuple of values.
+
+    Every intermediate object (e.g. ``hdpData.homeInfo``) is looked up once
+    and shared by all fields that read from it.
+    """
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING, "_EMPTY": {}}
+    lines = ["def extract(house):"]
+    objects = {(): "house"}
+
+    def resolve(prefix: Tuple[str, ...]) -> str:
+        name = objects.get(prefix)
+        if name is None:
+            parent = resolve(prefix[:-1])
+            name = f"_o{len(objects)}"
+            lines.append(f"    {name} = {parent}.get({prefix[-1]!r})")
+            lines.append(f"    if not isinstance({name}, dict):")
+            lines.append(f"        {name} = _EMPTY")
+            objects[prefix] = name
+        return name
+
+    outputs = []
+    for index, field in enumerate(fields):
+        value = f"v{index}"
+        unusable = (
+            f"{value} is _MISSING or not {value}"
+            if field.truthy
+            else f"{value} is _MISSING"
+        )
+        lines.append(f"    {value} = _MISSING")
+        for path in field.paths:
+            parent = resolve(tuple(path[:-1]))
+            lines.append(f"    if {unusable}:")
+            lines.append(f"        {value} = {parent}.get({path[-1]!r}, _MISSING)")
+
+        if callable(field.default):
+            namespace[f"_default{index}"] = field.default
+            default = f"_default{index}()"
+        else:
+            namespace[f"_default{index}"] = field.default
+            default = f"_default{index}"
+        lines.append(f"    if {unusable}:")
+        lines.append(f"        {value} = {default}")
+        if field.coerce is not None:
+            namespace[f"_coerce{index}"] = field.coerce
+            lines.append(f"    {value} = _coerce{index}({value})")
+        outputs.append(value)
+
+    lines.append(f"    return ({', '.join(outputs)},)")
+    exec(compile("\n".join(lines), "<compiled extractor>", "exec"), namespace)
+    return namespace["extract"]
+
+
+class ListingExtractor:
+    """Single-pass replacement for Parser.parse_listing.
+
+    House and address fields are read by one compiled function; images are
+    collected from ``carouselPhotos`` in the same call.
+    """
+
+    def __init__(
+        self,
+        house_fields: Sequence[Field] = HOUSE_FIELDS,
+        address_fields: Sequence[Field] = ADDRESS_FIELDS,
+        deterministic_ids: bool = False,
+    ):
+        self.deterministic_ids = deterministic_ids
+        self._house_count = len(house_fields)
+        self._zipcode_index = [field.name for field in address_fields].index(
+            "zipcode"
+        )
+        self._extract = compile_fields(tuple(house_fields) + tuple(address_fields))
+
+    def parse_listing(
+        self, house: Dict[str, Any]
+    ) -> Optional[Tuple[tuple, Optional[str], Optional[tuple], List[tuple]]]:
+        """Same output as Parser.parse_listing."""
+        try:
+            values = self._extract(house)
+        except InvalidValue as e:
+            item_logger.warning("%s", e)
+            return None
+
+        deterministic = self.deterministic_ids
+        # values[0] is the zpid
+        house_id = str(house_uuid(values[0]) if deterministic else uuid.uuid4())
+        house_row = (house_id,) + values[: self._house_count]
+
+        address_values = values[self._house_count :]
+        address_row = None
+        if address_values[self._zipcode_index]:
+            address_id = address_uuid(house_id) if deterministic else uuid.uuid4()
+            address_row = (str(address_id),) + address_values + (house_id,)
+
+        image_rows = []
+        for img in house.get("carouselPhotos") or ():
+            url = img.get("url")
+            if url:
+                image_id = image_uuid(house_id, url) if deterministic else uuid.uuid4()
+                image_rows.append((str(image_id), house_id, url))
+
+        return house_row, house.get("brokerName"), address_row, image_rows
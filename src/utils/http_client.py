@@ -0,0 +1,205 @@
+import time
+import threading
+from collections import deque
+
+from utils.logger import setup_logger
+from utils.metrics import get_metrics
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Setup logger
+logger = setup_logger()
+
+# Brotli responses can only be decoded when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# Time spent opening TCP/TLS connections by the current thread's request
+_timing = threading.local()
+
+
+def _record_connect(start: float) -> None:
+    _timing.connect = getattr(_timing, "connect", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections record how long connecting took."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """Persistent HTTP session with keep-alive, compression and latency tracking.
+
+    Connections are pooled and reused across pages, cookies persist for the
+    lifetime of the client, and each request's latency is split into
+    connect, time-to-first-byte and body transfer.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        pool_maxsize: int = 10,
+        latency_samples: int = 1000,
+    ):
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers or {})
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.session.headers["Connection"] = "keep-alive"
+
+        self._lock = threading.Lock()
+        self._samples: Deque[Tuple[float, float, float]] = deque(
+            maxlen=latency_samples
+        )
+        self._requests = 0
+        self._new_connections = 0
+        self._totals = {"connect": 0.0, "ttfb": 0.0, "transfer": 0.0}
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request and read its body, recording the latency split."""
+        response, timing = self._send(method, url, kwargs)
+        response.content  # read (and decompress) the body
+        self._record(method, response, timing, time.perf_counter())
+        return response
+
+    def stream(
+        self, method: str, url: str, chunk_size: int = 64 * 1024, **kwargs: Any
+    ) -> Tuple[requests.Response, Iterator[bytes]]:
+        """Send a request and return its decompressed body as chunks.
+
+        The body is read as the iterator is consumed; latency is recorded
+        and the connection released once it is exhausted or closed.
+        """
+        response, timing = self._send(method, url, kwargs)
+
+        def body() -> Iterator[bytes]:
+            try:
+                yield from response.iter_content(chunk_size)
+            finally:
+                self._record(method, response, timing, time.perf_counter())
+                response.close()
+
+        return response, body()
+
+    def _send(
+        self, method: str, url: str, kwargs: Dict[str, Any]
+    ) -> Tuple[requests.Response, Tuple[float, float, float]]:
+        """Send a request without reading its body.
+
+        Returns the response and its (start, connect seconds, headers
+        received) timings.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        _timing.connect = 0.0
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, stream=True, **kwargs)
+        except requests.RequestException as e:
+            get_metrics().inc(
+                "http_errors_total", help="Failed HTTP requests", error=type(e).__name__
+            )
+            raise
+        return response, (start, _timing.connect, time.perf_counter())
+
+    def _record(
+        self,
+        method: str,
+        response: requests.Response,
+        timing: Tuple[float, float, float],
+        end: float,
+    ) -> None:
+        start, connect, headers_at = timing
+        ttfb = max(0.0, headers_at - start - connect)
+        transfer = end - headers_at
+        with self._lock:
+            self._requests += 1
+            if connect > 0:
+                self._new_connections += 1
+            self._totals["connect"] += connect
+            self._totals["ttfb"] += ttfb
+            self._totals["transfer"] += transfer
+            self._samples.append((connect, ttfb, transfer))
+        metrics = get_metrics()
+        metrics.inc(
+            "http_responses_total",
+            help="HTTP responses by status code",
+            status=response.status_code,
+        )
+        metrics.observe(
+            "http_request_seconds", end - start, "HTTP request latency", method=method
+        )
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def stream_put(
+        self, url: str, **kwargs: Any
+    ) -> Tuple[requests.Response, Iterator[bytes]]:
+        return self.stream("PUT", url, **kwargs)
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Average and p95 connect/TTFB/transfer seconds over recent requests."""
+        with self._lock:
+            samples = list(self._samples)
+            stats: Dict[str, Any] = {
+                "requests": self._requests,
+                "new_connections": self._new_connections,
+            }
+            for name, total in self._totals.items():
+                stats[f"{name}_avg"] = total / self._requests if self._requests else 0.0
+
+        for index, name in enumerate(("connect", "ttfb", "transfer")):
+            values = sorted(sample[index] for sample in samples)
+            stats[f"{name}_p95"] = (
+                values[min(len(values) - 1, int(len(values) * 0.95))] if values else 0.0
+            )
+        return stats
+
+    def close(self) -> None:
+        self.session.close()
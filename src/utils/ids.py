@@ -0,0 +1,20 @@
+import uuid
+
+# Fixed namespace for name-based (UUIDv5) listing ids. Changing it would
+# change every deterministic id, so it must never be edited.
+LISTING_NAMESPACE = uuid.UUID("5d0f4a52-7c1e-4b8e-9a39-3f2f1f6c8a10")
+
+
+def house_uuid(zpid) -> uuid.UUID:
+    """Stable house id for a zpid."""
+    return uuid.uuid5(LISTING_NAMESPACE, f"house:{zpid}")
+
+
+def address_uuid(house_id) -> uuid.UUID:
+    """Stable address id for a house (one address per house)."""
+    return uuid.uuid5(LISTING_NAMESPACE, f"address:{house_id}")
+
+
+def image_uuid(house_id, url: str) -> uuid.UUID:
+    """Stable image id for a house's image URL."""
+    return uuid.uuid5(LISTING_NAMESPACE, f"image:{house_id}:{url}")
@@ -0,0 +1,231 @@
+import re
+import json
+import codecs
+
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+# orjson decodes whole documents several times faster than json
+try:
+    import orjson
+
+    loads: Callable[[bytes], Any] = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    loads = json.loads
+    JSON_BACKEND = "json"
+
+LIST_RESULTS_PATH = ("cat1", "searchResults", "listResults")
+
+# Only ASCII bytes are structural, so UTF-8 text can be scanned as bytes
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.S)
+_SCALAR = re.compile(rb"[^,}\]\s]+")
+# Everything up to the next bracket, complete strings included
+_RUN = re.compile(rb'(?:[^"{}\[\]]+|"(?:[^"\\]|\\.)*")*', re.S)
+
+_DECODER = json.JSONDecoder()
+_DELIMITER = re.compile(r"\s*[,\]}]")
+_INVALID = object()
+
+
+class _Reader:
+    """Buffer over an iterable of byte chunks, pulling more as needed."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.buf = b""
+        self.pos = 0
+        # Objects entered by find and not yet closed
+        self.depth = 0
+
+    def fill(self) -> bool:
+        for chunk in self.chunks:
+            if chunk:
+                self.buf = self.buf[self.pos :] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def fill_to(self, size: int) -> bool:
+        """Read until ``size`` bytes are buffered past the cursor, or the end.
+
+        Returns False when nothing more could be read.
+        """
+        grew = False
+        while len(self.buf) - self.pos < size and self.fill():
+            grew = True
+        return grew
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} near {self.buf[self.pos:self.pos + 40]!r}")
+
+    def peek(self) -> bytes:
+        """Next non-whitespace byte without consuming it; b"" at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos : self.pos + 1]
+            if not self.fill():
+                return b""
+
+    def expect(self, char: bytes) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expected {char!r}")
+        self.pos += 1
+
+    def consume(self, pattern: "re.Pattern[bytes]") -> bytes:
+        """Match ``pattern`` at the cursor, reading on while it could grow."""
+        while True:
+            match = pattern.match(self.buf, self.pos)
+            if match and match.end() < len(self.buf):
+                break
+            if not self.fill():
+                if not match or not match.group():
+                    raise self.error("Truncated JSON")
+                break
+        self.pos = match.end()
+        return match.group()
+
+    def skip_container(self) -> None:
+        depth = 0
+        while True:
+            self.pos = _RUN.match(self.buf, self.pos).end()
+            if self.pos == len(self.buf) or self.buf[self.pos] == 0x22:  # '"'
+                # Out of data, or a string that continues in the next chunk
+                if not self.fill():
+                    raise self.error("Truncated JSON")
+                continue
+            if self.buf[self.pos] in b"{[":
+                depth += 1
+            else:
+                depth -= 1
+            self.pos += 1
+            if depth == 0:
+                return
+
+    def skip_value(self) -> None:
+        char = self.peek()
+        if char in (b"{", b"["):
+            self.skip_container()
+        elif char == b'"':
+            self.consume(_STRING)
+        else:
+            self.consume(_SCALAR)
+
+    def decode_value(self, window: int = 16 * 1024) -> Any:
+        """Decode the value at the cursor with the C decoder.
+
+        ``raw_decode`` both builds the value and finds where it ends; a
+        window that turns out too short is grown, or more data read.
+        """
+        while True:
+            raw = self.buf[self.pos : self.pos + window]
+            text, used = codecs.utf_8_decode(raw, "strict", False)
+            try:
+                value, end = _DECODER.raw_decode(text)
+            except json.JSONDecodeError:
+                value, end = _INVALID, len(text)
+            # Containers end at their bracket; a scalar (e.g. a number cut by
+            # the window) is only known to be complete once a delimiter follows
+            if not isinstance(value, (dict, list)) and (
+                value is _INVALID or not _DELIMITER.match(text, end)
+            ):
+                # Retry with twice the data, so long values stay linear
+                seen_all = self.pos + len(raw) == len(self.buf)
+                window = 2 * len(raw)
+                if not seen_all or self.fill_to(window):
+                    continue
+                raise self.error("Invalid or truncated JSON")
+            # Pure ASCII text has as many characters as bytes
+            self.pos += end if used == len(text) else len(text[:end].encode())
+            return value
+
+    def find(self, path: Sequence[str]) -> bool:
+        """Advance to the value at ``path`` (object keys from the root)."""
+        for key in path:
+            wanted = json.dumps(key).encode()
+            if self.peek() != b"{":
+                self.skip_value()
+                return False
+            self.pos += 1
+            self.depth += 1
+            while True:
+                char = self.peek()
+                if char == b",":
+                    self.pos += 1
+                    continue
+                if char != b'"':
+                    return False
+                name = self.consume(_STRING)
+                self.expect(b":")
+                if name == wanted:
+                    break
+                self.skip_value()
+        return True
+
+    def close(self) -> None:
+        """Skip the rest of the objects ``find`` entered, then expect the end."""
+        while self.depth:
+            char = self.peek()
+            if char == b",":
+                self.pos += 1
+            elif char == b"}":
+                self.pos += 1
+                self.depth -= 1
+            elif char == b'"':
+                self.consume(_STRING)
+                self.expect(b":")
+                self.skip_value()
+            else:
+                raise self.error("Malformed or truncated JSON object")
+        if self.peek():
+            raise self.error("Extra data after JSON")
+
+    def drain(self) -> None:
+        """Read the rest of the body without scanning it.
+
+        Only checks that the body still ends like an object, which catches
+        a truncated one without the cost of skipping every subtree.
+        """
+        tail = self.buf[self.pos :]
+        for chunk in self.chunks:
+            if chunk.strip():
+                tail = chunk
+        if not tail.rstrip().endswith(b"}"):
+            raise self.error("Truncated JSON")
+
+
+def iter_items(
+    chunks: Iterable[bytes], path: Sequence[str] = LIST_RESULTS_PATH
+) -> Iterator[Any]:
+    """Yield the elements of the array at ``path`` as the body streams in.
+
+    Only the elements are decoded; every other subtree is skipped by
+    scanning, so it is never built as Python objects.
+    Yields nothing when a well-formed object lacks ``path``. The rest of
+    the body is read to its end, so a pooled connection can be reused.
+    Raises ValueError when the body is not a JSON object (e.g. an HTML
+    block page) or is malformed or truncated.
+    """
+    reader = _Reader(chunks)
+    if reader.peek() != b"{":
+        raise reader.error("Expected a JSON object")
+    if reader.find(path):
+        if reader.peek() == b"[":
+            reader.pos += 1
+            while True:
+                char = reader.peek()
+                if char == b"]":
+                    reader.pos += 1
+                    break
+                if char == b",":
+                    reader.pos += 1
+                    continue
+                if not char:
+                    raise reader.error("Truncated JSON")
+                yield reader.decode_value()
+            # Found: the rest (e.g. mapResults) is not worth scanning
+            reader.drain()
+            return
+        reader.skip_value()
+    reader.close()
@@ -1,21 +1,127 @@
-import logging
 import os
-from datetime import datetime
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
 
+from typing import Dict, Optional, TextIO, Tuple
 
-def setup_logger():
-    """Configure logging to both file and console with source file information."""
-    # Get the root logger
-    root_logger = logging.getLogger()
+ITEM_LOGGER = "items"
 
-    # If the logger already has handlers, return it to prevent duplicates
-    if root_logger.handlers:
-        return root_logger
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "source": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with only the message merged on the calling thread.
+
+    The stock ``prepare`` runs the full formatter and copies the record,
+    which is most of the cost the queue is meant to move off the caller.
+    Records stay in-process, so ``exc_info`` is kept for the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per call site (file and line) for per-item log lines.
+
+    Each call site may emit ``burst`` records at once and ``rate`` per second
+    after that; the next record let through reports how many were dropped.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 10):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            # [tokens, last refill, suppressed]
+            bucket = self._buckets.setdefault(key, [float(self.burst), now, 0])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed} similar suppressed)"
+        return True
+
+
+def get_item_logger(rate: float = 1.0, burst: int = 10) -> logging.Logger:
+    """Logger for per-listing / per-image messages, rate-limited per call site.
+
+    Propagates to the root handlers. Call sites should pass arguments lazily
+    (``log.debug("x %s", y)``) so disabled levels cost no formatting.
+    """
+    item_logger = logging.getLogger(ITEM_LOGGER)
+    if not any(isinstance(f, RateLimitFilter) for f in item_logger.filters):
+        item_logger.addFilter(RateLimitFilter(rate, burst))
+    return item_logger
+
+
+def configure_logging(
+    use_queue: bool = False,
+    json_format: bool = False,
+    level: int = logging.INFO,
+    logs_dir: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+) -> logging.Logger:
+    """(Re)configure the root logger with a file and a console handler.
+
+    With ``use_queue`` the root logger only enqueues records and a
+    QueueListener thread formats and writes them, so callers never block on
+    I/O. Replaces any handlers and listener set up earlier.
+    """
+    global _listener
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+        handler.close()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
     # Create logs directory if it doesn't exist
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(current_dir))
-    logs_dir = os.path.join(project_root, "logs")
+    if logs_dir is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(os.path.dirname(current_dir))
+        logs_dir = os.path.join(project_root, "logs")
     os.makedirs(logs_dir, exist_ok=True)
 
     # Create a unique log file name with timestamp
@@ -23,21 +129,64 @@ def setup_logger():
     log_file = os.path.join(logs_dir, f"app_{timestamp}.log")
 
     # Create formatters
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    if json_format:
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
 
     # Create handlers
     file_handler = logging.FileHandler(log_file)
     file_handler.setFormatter(formatter)
 
-    console_handler = logging.StreamHandler()
+    console_handler = logging.StreamHandler(stream)
     console_handler.setFormatter(formatter)
 
     # Configure root logger
-    root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.setLevel(level)
+    if use_queue:
+        records: queue.Queue = queue.Queue(-1)
+        root_logger.addHandler(_QueueHandler(records))
+        _listener = logging.handlers.QueueListener(
+            records, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+    else:
+        root_logger.addHandler(file_handler)
+        root_logger.addHandler(console_handler)
 
     return root_logger
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def setup_logger():
+    """Configure logging to both file and console with source file information.
+
+    The first call configures the root logger from the environment:
+    ``LOG_QUEUE=1`` writes through a background QueueListener,
+    ``LOG_FORMAT=json`` emits JSON lines and ``LOG_LEVEL`` sets the level.
+    """
+    # Get the root logger
+    root_logger = logging.getLogger()
+
+    # If the logger already has handlers, return it to prevent duplicates
+    if root_logger.handlers:
+        return root_logger
+
+    return configure_logging(
+        use_queue=os.getenv("LOG_QUEUE", "").lower() in ("1", "true", "yes"),
+        json_format=os.getenv("LOG_FORMAT", "").lower() == "json",
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    )
@@ -0,0 +1,336 @@
+import os
+import json
+import math
+import time
+import uuid
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.logger import setup_logger
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Setup logger
+logger = setup_logger()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    # Full precision: ":g" keeps 6 digits, so large counters would look stuck
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return "NaN" if math.isnan(value) else repr(value)
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, key: LabelKey, value: float) -> None:
+        self.values[key] = self.values.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self.values: Dict[LabelKey, list] = {}
+
+    def observe(self, key: LabelKey, value: float) -> None:
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(key, ("le", le))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(key)} {_format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms, rendered in Prometheus text format.
+
+    Metrics are created on first use, so call sites only name them. ``span``
+    times a stage into ``stage_seconds`` and, when a ``tracer`` is set, also
+    records the span with its parent for the current thread.
+    """
+
+    def __init__(self, tracer: Optional["SpanTracer"] = None):
+        self.tracer = tracer
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics.setdefault(name, factory())
+        return metric
+
+    def inc(
+        self, name: str, value: float = 1.0, help: str = "", **labels: Any
+    ) -> None:
+        with self._lock:
+            counter = self._get(name, lambda: Counter(name, help or name))
+            counter.inc(_label_key(labels), value)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        help: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        **labels: Any,
+    ) -> None:
+        with self._lock:
+            histogram = self._get(name, lambda: Histogram(name, help or name, buckets))
+            histogram.observe(_label_key(labels), value)
+
+    @contextmanager
+    def timer(self, name: str, help: str = "", **labels: Any) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, help, **labels)
+
+    @contextmanager
+    def span(self, stage: str, **attributes: Any) -> Iterator[None]:
+        """Time a pipeline stage (fetch, parse, persist, ...)."""
+        tracer = self.tracer
+        token = tracer.start(stage, attributes) if tracer is not None else None
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(
+                "stage_seconds", duration, "Duration of pipeline stages", stage=stage
+            )
+            if token is not None:
+                tracer.finish(token, duration, error)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            for name in sorted(self._metrics):
+                lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+class SpanTracer:
+    """Append finished spans as JSON lines to ``path``.
+
+    Parent/child links follow the nesting of ``MetricsRegistry.span`` blocks
+    on each thread; every outermost span starts a new trace.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def start(self, name: str, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        span = {
+            "name": name,
+            "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent["span_id"] if parent else None,
+            "start": time.time(),
+            "attributes": attributes,
+        }
+        stack.append(span)
+        return span
+
+    def finish(
+        self, span: Dict[str, Any], duration: float, error: Optional[BaseException]
+    ) -> None:
+        stack = self._local.stack
+        if stack and stack[-1] is span:
+            stack.pop()
+        span["duration"] = duration
+        if error is not None:
+            span["error"] = f"{type(error).__name__}: {error}"
+        line = json.dumps(span, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def instrument_methods(
+    prefix: str, metric: str = "db_call_seconds"
+) -> Callable[[type], type]:
+    """Class decorator timing every public method into ``metric``.
+
+    Each call is observed with ``method="<prefix>.<name>"``, whether it
+    returns or raises. Methods returning iterators (``iter_*``) are skipped,
+    since only their creation would be timed.
+    """
+
+    def wrap(name: str, method: Callable) -> Callable:
+        label = f"{prefix}.{name}"
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                get_metrics().observe(
+                    metric,
+                    time.perf_counter() - start,
+                    "Repository method latency",
+                    method=label,
+                )
+
+        return timed
+
+    def decorate(cls: type) -> type:
+        for name, value in list(vars(cls).items()):
+            if name.startswith("_") or name.startswith("iter_"):
+                continue
+            if isinstance(value, staticmethod):
+                setattr(cls, name, staticmethod(wrap(name, value.__func__)))
+            elif callable(value):
+                setattr(cls, name, wrap(name, value))
+        return cls
+
+    return decorate
+
+
+class PrometheusExporter:
+    """Serve ``GET /metrics`` in Prometheus text format from a daemon thread."""
+
+    def __init__(
+        self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108
+    ):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FileExporter:
+    """Rewrite ``path`` with the Prometheus text every ``interval`` seconds.
+
+    Suits node_exporter's textfile collector or a plain post-run dump; the
+    file is replaced atomically and written once more on ``stop``.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.export()
+
+    def export(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(self.registry.render())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not write metrics file {self.path}: {str(e)}")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.export()
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _metrics
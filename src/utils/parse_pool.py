@@ -0,0 +1,92 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.extractor import ListingExtractor
+from utils.logger import setup_logger
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Setup logger
+logger = setup_logger()
+
+# Per-process compiled extractors used by pool workers
+_extractors = {
+    False: ListingExtractor(),
+    True: ListingExtractor(deterministic_ids=True),
+}
+
+ParsedListing = Tuple[tuple, Optional[str], Optional[tuple], List[tuple]]
+
+
+def parse_chunk(
+    houses: List[Dict[str, Any]], deterministic_ids: bool = False
+) -> List[Optional[ParsedListing]]:
+    """Parse a chunk of listings; failed listings come back as None."""
+    extractor = _extractors[deterministic_ids]
+    parsed = []
+    for house in houses:
+        try:
+            parsed.append(extractor.parse_listing(house))
+        except Exception as e:
+            logger.error(f"Error parsing house data: {str(e)}")
+            parsed.append(None)
+    return parsed
+
+
+class ParsePool:
+    """Parse pages of listings on a process pool, keeping output in input order.
+
+    Pages are split into chunks of ``chunk_size`` listings so one large page
+    is spread across workers. ``parse_pages`` keeps up to ``prefetch`` pages
+    in flight, so the caller can write one page while later pages parse.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 50,
+        prefetch: int = 2,
+        deterministic_ids: bool = False,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self.deterministic_ids = deterministic_ids
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        logger.info(f"ParsePool initialized with {self.workers} workers")
+
+    def _submit(self, houses: List[Dict[str, Any]]) -> list:
+        return [
+            self._executor.submit(
+                parse_chunk, houses[i : i + self.chunk_size], self.deterministic_ids
+            )
+            for i in range(0, len(houses), self.chunk_size)
+        ]
+
+    @staticmethod
+    def _collect(futures: list) -> List[Optional[ParsedListing]]:
+        parsed = []
+        for future in futures:
+            parsed.extend(future.result())
+        return parsed
+
+    def parse_page(self, houses: List[Dict[str, Any]]) -> List[Optional[ParsedListing]]:
+        """Parse one page; the result lines up with ``houses``."""
+        return self._collect(self._submit(houses))
+
+    def parse_pages(
+        self, pages: Iterable[Any]
+    ) -> Iterator[Tuple[Any, List[Optional[ParsedListing]]]]:
+        """Yield ``(key, parsed)`` for ``(key, houses)`` pages, in input order."""
+        in_flight: Deque[Tuple[Any, list]] = deque()
+        for key, houses in pages:
+            in_flight.append((key, self._submit(houses)))
+            if len(in_flight) > self.prefetch:
+                done_key, futures = in_flight.popleft()
+                yield done_key, self._collect(futures)
+        while in_flight:
+            done_key, futures = in_flight.popleft()
+            yield done_key, self._collect(futures)
+
+    def close(self) -> None:
+        self._executor.shutdown()
@@ -1,15 +1,20 @@
 import logging
 import uuid
 import random
-from utils.logger import setup_logger
+from utils.logger import get_item_logger, setup_logger
+from utils.ids import address_uuid, house_uuid, image_uuid
 
 # Setup logger
 logger = setup_logger()
+# Per-listing messages are rate-limited per call site
+item_logger = get_item_logger()
 
 
 class Parser:
-    def __init__(self):
-        pass
+    def __init__(self, deterministic_ids: bool = False):
+        # With deterministic ids (UUIDv5 from zpid / image URL) re-crawls
+        # upsert the same rows instead of appending new ones
+        self.deterministic_ids = deterministic_ids
 
     def generate_random_zpid(self):
 
@@ -18,8 +23,6 @@ class Parser:
 
     def parse_house_data(self, house):
 
-        id = uuid.uuid4()
-
         # Get zpid from the house data or generate a random one
 
         if house.get("id"):
@@ -29,13 +32,15 @@ class Parser:
         else:
             zpid = self.generate_random_zpid()
 
+        id = house_uuid(zpid) if self.deterministic_ids else uuid.uuid4()
+
         # Clean price value
         price = house.get("unformattedPrice")
         if isinstance(price, str):
             try:
                 price = float("".join(filter(str.isdigit, price)))
             except (ValueError, TypeError):
-                logger.warning(f"Could not parse price value: {price}")
+                item_logger.warning("Could not parse price value: %s", price)
                 return None
         elif price is None:
             price = 0
@@ -50,14 +55,14 @@ class Parser:
                 area = float(area)
             except (ValueError, TypeError):
                 area = None
-                logger.warning(f"Could not parse area value: {area}")
+                item_logger.warning("Could not parse area value: %s", area)
 
         beds = int(house.get("beds", 0))
         if beds == 0:
             try:
                 beds = int(house.get("hdpData", {}).get("homeInfo", {}).get("beds", 0))
             except (ValueError, TypeError):
-                logger.warning(f"Could not parse beds value: {beds}")
+                item_logger.warning("Could not parse beds value: %s", beds)
 
         baths = int(house.get("baths", 0))
         if baths == 0:
@@ -66,10 +71,10 @@ class Parser:
                     house.get("hdpData", {}).get("homeInfo", {}).get("baths", 0)
                 )
             except (ValueError, TypeError):
-                logger.warning(f"Could not parse baths value: {baths}")
+                item_logger.warning("Could not parse baths value: %s", baths)
 
         status_type = house.get("statusType", "STATUS_TYPE_UNKNOWN")
-        logger.warn(f"baths and beds: {baths} {beds}")
+        item_logger.debug("baths and beds: %s %s", baths, beds)
         house_data = [
             id,
             zpid,
@@ -95,7 +100,7 @@ class Parser:
             return None
 
         return [
-            uuid.uuid4(),
+            address_uuid(house_id) if self.deterministic_ids else uuid.uuid4(),
             house.get("hdpData", {}).get("homeInfo", {}).get("streetAddress"),
             house.get("hdpData", {}).get("homeInfo", {}).get("city"),
             house.get("hdpData", {}).get("homeInfo", {}).get("state"),
@@ -111,20 +116,49 @@ class Parser:
         """Parse image data from house object."""
         images = []
         carousel_photos = house.get("carouselPhotos", [])
-        logger.warn(
-            f"Found {len(carousel_photos)} carousel photos for house {house_id}"
+        item_logger.debug(
+            "Found %d carousel photos for house %s", len(carousel_photos), house_id
         )
 
         for img in carousel_photos:
             if img.get("url"):
-                logger.warn(f"Processing image URL: {img.get('url')}")
-                images.append([uuid.uuid4(), house_id, img.get("url")])
+                item_logger.debug("Processing image URL: %s", img.get("url"))
+                image_id = (
+                    image_uuid(house_id, img.get("url"))
+                    if self.deterministic_ids
+                    else uuid.uuid4()
+                )
+                images.append([image_id, house_id, img.get("url")])
             else:
-                logger.warning(f"Image object missing URL: {img}")
+                item_logger.warning("Image object missing URL: %s", img)
 
-        logger.warn(f"Successfully parsed {len(images)} images for house {house_id}")
+        item_logger.debug("Parsed %d images for house %s", len(images), house_id)
         return images
 
     def reset_data(self, brokers_data):
 
         brokers_data.clear()
+
+    def parse_listing(self, house):
+        """Parse one listing into compact rows for batch ingestion.
+
+        Returns ``(house_row, broker_name, address_row, image_rows)`` with ids
+        as strings and rows as tuples, or None if the house cannot be parsed.
+        ``house_row`` does not include broker_id; the caller resolves it.
+        """
+        house_data = self.parse_house_data(house)
+        if not house_data:
+            return None
+        house_id = str(house_data[0])
+        house_data[0] = house_id
+
+        address_data = self.parse_address_data(house, house_id)
+        if address_data:
+            address_data[0] = str(address_data[0])
+            address_data = tuple(address_data)
+
+        image_data = [
+            (str(image_id), image_house_id, url)
+            for image_id, image_house_id, url in self.parse_image_data(house, house_id)
+        ]
+        return tuple(house_data), house.get("brokerName"), address_data, image_data
@@ -0,0 +1,99 @@
+import os
+import json
+import threading
+
+from utils.logger import setup_logger
+from typing import Any, Dict, Optional, Tuple
+
+# Setup logger
+logger = setup_logger()
+
+PAYLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payloads")
+
+# Placeholder serialized in place of pagination.currentPage
+_PAGE_MARKER = "__CURRENT_PAGE__"
+
+
+class PayloadRegistry:
+    """Search payload templates keyed by region name, loaded from disk once.
+
+    ``body`` returns a cheap per-page copy where only ``pagination`` is new;
+    ``serialized`` returns the JSON request body from pre-serialized parts.
+    """
+
+    def __init__(self, payloads_dir: str = PAYLOADS_DIR):
+        self.payloads_dir = payloads_dir
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._serialized: Dict[str, Tuple[bytes, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, payload: Dict[str, Any]) -> None:
+        """Add (or replace) the template for a region."""
+        prefix, suffix = self._split(payload)
+        with self._lock:
+            self._templates[name] = payload
+            self._serialized[name] = (prefix, suffix)
+        logger.info(f"Registered search payload for region {name}")
+
+    def template(self, name: str) -> Dict[str, Any]:
+        """The shared template for a region; callers must not mutate it."""
+        payload = self._templates.get(name)
+        if payload is None:
+            payload = self._load(name)
+        return payload
+
+    def body(self, name: str, page: int) -> Dict[str, Any]:
+        """Payload for ``page``; all nested objects but ``pagination`` are shared."""
+        template = self.template(name)
+        payload = dict(template)
+        state = dict(template["searchQueryState"])
+        state["pagination"] = {**state.get("pagination", {}), "currentPage": page}
+        payload["searchQueryState"] = state
+        return payload
+
+    def serialized(self, name: str, page: int) -> bytes:
+        """JSON-encoded payload for ``page`` without re-serializing the template."""
+        parts = self._serialized.get(name)
+        if parts is None:
+            self._load(name)
+            parts = self._serialized[name]
+        prefix, suffix = parts
+        return prefix + str(int(page)).encode() + suffix
+
+    def names(self):
+        return list(self._templates)
+
+    def _load(self, name: str) -> Dict[str, Any]:
+        path = os.path.join(self.payloads_dir, f"{name}.json")
+        with self._lock:
+            payload = self._templates.get(name)
+            if payload is not None:
+                return payload
+            with open(path, "r") as f:
+                payload = json.load(f)
+            self._templates[name] = payload
+            self._serialized[name] = self._split(payload)
+        logger.info(f"Loaded search payload for region {name} from {path}")
+        return payload
+
+    @staticmethod
+    def _split(payload: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        state = dict(payload["searchQueryState"])
+        state["pagination"] = {
+            **state.get("pagination", {}),
+            "currentPage": _PAGE_MARKER,
+        }
+        encoded = json.dumps({**payload, "searchQueryState": state}).encode()
+        prefix, suffix = encoded.split(json.dumps(_PAGE_MARKER).encode(), 1)
+        return prefix, suffix
+
+
+_default_registry: Optional[PayloadRegistry] = None
+
+
+def get_registry() -> PayloadRegistry:
+    """Process-wide payload registry."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = PayloadRegistry()
+    return _default_registry
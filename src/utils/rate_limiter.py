@@ -0,0 +1,92 @@
+import time
+import asyncio
+import threading
+
+
+class TokenBucket:
+    """Token-bucket rate limiter.
+
+    Allows ``rate`` requests per second on average with bursts of up to
+    ``capacity`` requests. Usable from threads (``acquire``) and from
+    asyncio code (``acquire_async``).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Invalid token bucket: rate={rate}, capacity={capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block the current thread until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Suspend the current task until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose rate adapts to server responses (AIMD).
+
+    Each throttle event (429/503) multiplies the rate by ``decrease`` down to
+    ``min_rate``; every ``success_window`` consecutive successes add
+    ``increase`` requests/second up to ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: float = 5.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        success_window: int = 10,
+    ):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.success_window = success_window
+        self._successes = 0
+        self.throttle_events = 0
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self._refill()
+            self.throttle_events += 1
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.success_window:
+                self._refill()
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
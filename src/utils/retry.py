@@ -0,0 +1,135 @@
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from utils.logger import setup_logger
+from typing import Any, Callable, Dict, Optional
+
+# Setup logger
+logger = setup_logger()
+
+
+class FetchError(Exception):
+    """A request failed and should not be retried (e.g. a 4xx response)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RetryableFetchError(FetchError):
+    """A request failed transiently (429, 5xx, timeout, connection error)."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message, status)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def check_status(status: int, headers: Dict[str, str]) -> None:
+    """Raise the matching fetch error for a non-2xx HTTP status."""
+    if status == 429 or status >= 500:
+        raise RetryableFetchError(
+            f"HTTP {status}",
+            status=status,
+            retry_after=parse_retry_after(headers.get("Retry-After")),
+        )
+    if status >= 400:
+        raise FetchError(f"HTTP {status}", status=status)
+
+
+class RetryPolicy:
+    """Retry transient fetch errors with exponential backoff and full jitter.
+
+    ``RetryableFetchError`` is retried up to ``max_attempts`` times, honoring
+    its ``retry_after`` when the server sent one; ``FetchError`` fails fast.
+    An optional adaptive limiter is told about throttling and successes.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        limiter=None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._counters = {
+            "attempts": 0,
+            "retries": 0,
+            "throttled": 0,
+            "failed": 0,
+            "succeeded": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number ``attempt`` (1-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``func`` until it succeeds, fails fast, or attempts run out."""
+        for attempt in range(1, self.max_attempts + 1):
+            self._count("attempts")
+            try:
+                result = func(*args, **kwargs)
+            except RetryableFetchError as e:
+                if e.status == 429 or e.status == 503:
+                    self._count("throttled")
+                    if self.limiter is not None:
+                        self.limiter.on_throttle()
+                if attempt == self.max_attempts:
+                    self._count("failed")
+                    raise
+                delay = self.backoff(attempt, e.retry_after)
+                self._count("retries")
+                logger.warning(
+                    f"Attempt {attempt}/{self.max_attempts} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+            except FetchError:
+                self._count("failed")
+                raise
+            else:
+                self._count("succeeded")
+                if self.limiter is not None:
+                    self.limiter.on_success()
+                return result
@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import heapq
+import random
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import setup_logger
+from utils.retry import FetchError
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Setup logger
+logger = setup_logger()
+
+
+class CrawlJob:
+    """A region (or tile) crawl that is refreshed every ``interval`` seconds.
+
+    Higher ``priority`` jobs are dispatched first when several are due.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        region: str,
+        interval: float,
+        priority: int = 0,
+        max_pages: int = 20,
+        tiles: bool = False,
+    ):
+        self.name = name
+        self.region = region
+        self.interval = interval
+        self.priority = priority
+        self.max_pages = max_pages
+        self.tiles = tiles
+        self.next_run: Optional[float] = None
+        self.last_run: Optional[float] = None
+        self.runs = 0
+        self.failures = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CrawlJob":
+        return cls(
+            name=data["name"],
+            region=data.get("region", data["name"]),
+            interval=float(data["interval"]),
+            priority=int(data.get("priority", 0)),
+            max_pages=int(data.get("max_pages", 20)),
+            tiles=bool(data.get("tiles", False)),
+        )
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "next_run": self.next_run,
+            "last_run": self.last_run,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
+
+
+class BudgetExhausted(FetchError):
+    """The global request budget has no requests left in the current window."""
+
+
+class RequestBudget:
+    """Global cap of ``limit`` requests per sliding ``period`` seconds.
+
+    Shared by every scraper the scheduler runs, which call ``spend`` before
+    each request they send, so concurrent jobs together stay under it.
+    """
+
+    def __init__(self, limit: int, period: float = 3600.0):
+        self.limit = limit
+        self.period = period
+        self._spent: Deque[Tuple[float, int]] = deque()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _used(self, now: float) -> int:
+        while self._spent and self._spent[0][0] <= now - self.period:
+            self._total -= self._spent.popleft()[1]
+        return self._total
+
+    def spend(self, count: int = 1) -> bool:
+        """Charge ``count`` requests if they fit in the current window."""
+        with self._lock:
+            now = time.time()
+            if self._used(now) + count > self.limit:
+                return False
+            self._spent.append((now, count))
+            self._total += count
+            return True
+
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, self.limit - self._used(time.time()))
+
+
+class Scheduler:
+    """Run crawl jobs on their refresh intervals across a worker pool.
+
+    ``run_job(job)`` performs one crawl and returns the number of requests it
+    sent. The optional global ``budget`` is charged per request by the
+    crawls themselves; jobs are deferred while it is exhausted. Next runs
+    are jittered by ``jitter`` (a fraction of the interval) so jobs drift
+    apart, and job state is persisted to ``state_path`` after every run; on
+    restart, overdue jobs are spread over ``restart_spread`` seconds instead
+    of all starting at once.
+    """
+
+    def __init__(
+        self,
+        run_job: Callable[[CrawlJob], int],
+        workers: int = 4,
+        budget: Optional[RequestBudget] = None,
+        jitter: float = 0.1,
+        state_path: Optional[str] = None,
+        restart_spread: float = 300.0,
+        poll_interval: float = 1.0,
+    ):
+        self.run_job = run_job
+        self.workers = workers
+        self.budget = budget
+        self.jitter = jitter
+        self.state_path = state_path
+        self.restart_spread = restart_spread
+        self.poll_interval = poll_interval
+
+        self.jobs: Dict[str, CrawlJob] = {}
+        self._queue: List[Tuple[float, int, int, str]] = []
+        self._seq = itertools.count()
+        self._running: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def add(self, job: CrawlJob) -> None:
+        """Register a job; its first run is jittered within one jitter window."""
+        with self._lock:
+            self.jobs[job.name] = job
+        saved = self._load_state().get(job.name)
+        now = time.time()
+        if saved:
+            job.last_run = saved.get("last_run")
+            job.runs = saved.get("runs", 0)
+            job.failures = saved.get("failures", 0)
+            next_run = saved.get("next_run") or now
+            if next_run < now:
+                # Overdue after a restart: spread instead of stampeding
+                next_run = now + random.uniform(
+                    0, min(self.restart_spread, job.interval)
+                )
+        else:
+            next_run = now + random.uniform(0, self.jitter * job.interval)
+        self._schedule(job, next_run)
+
+    def _schedule(self, job: CrawlJob, next_run: float) -> None:
+        with self._lock:
+            job.next_run = next_run
+            heapq.heappush(
+                self._queue, (next_run, -job.priority, next(self._seq), job.name)
+            )
+        self._wakeup.set()
+
+    def _next_delay(self, job: CrawlJob) -> float:
+        return job.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _pop_due(self, now: float, free: int) -> List[CrawlJob]:
+        """Due jobs in (time, priority) order, at most ``free`` of them."""
+        due = []
+        with self._lock:
+            # Among jobs already due, higher priority goes first
+            ready = []
+            while self._queue and self._queue[0][0] <= now:
+                ready.append(heapq.heappop(self._queue))
+            ready.sort(key=lambda item: (item[1], item[0]))
+            for item in ready:
+                job = self.jobs.get(item[3])
+                if job is None or job.next_run != item[0] or job.name in self._running:
+                    continue
+                if len(due) < free:
+                    due.append(job)
+                else:
+                    heapq.heappush(self._queue, item)
+        return due
+
+    def _run(self, job: CrawlJob) -> None:
+        try:
+            logger.info(f"Running crawl job {job.name} (priority {job.priority})")
+            spent = self.run_job(job)
+            job.runs += 1
+            logger.info(f"Crawl job {job.name} sent {spent} requests")
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"Crawl job {job.name} failed: {str(e)}", exc_info=True)
+        finally:
+            job.last_run = time.time()
+            with self._lock:
+                self._running.pop(job.name, None)
+            self._schedule(job, job.last_run + self._next_delay(job))
+            self._save_state()
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """Dispatch jobs until ``stop()`` is called or ``duration`` elapses."""
+        deadline = time.time() + duration if duration is not None else None
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stopped.is_set():
+                now = time.time()
+                if deadline is not None and now >= deadline:
+                    break
+                with self._lock:
+                    free = self.workers - len(self._running)
+                for job in self._pop_due(now, free):
+                    if self.budget is not None and self.budget.remaining() < 1:
+                        logger.info(
+                            f"Request budget exhausted, deferring {job.name}"
+                        )
+                        self._schedule(job, now + self.poll_interval * 10)
+                        continue
+                    with self._lock:
+                        self._running[job.name] = executor.submit(self._run, job)
+
+                self._wakeup.clear()
+                self._wakeup.wait(self._sleep_time())
+        self._save_state()
+
+    def _sleep_time(self) -> float:
+        with self._lock:
+            if not self._queue:
+                return self.poll_interval
+            return max(0.0, min(self.poll_interval, self._queue[0][0] - time.time()))
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read scheduler state: {str(e)}")
+            return {}
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {name: job.state() for name, job in self.jobs.items()}
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.error(f"Could not save scheduler state: {str(e)}")
+
+
+def load_jobs(path: str) -> List[CrawlJob]:
+    """Read a JSON list of job definitions.
+
+    Each entry has ``name`` and ``interval`` (seconds) and optionally
+    ``region`` (payload name, defaults to ``name``), ``priority``,
+    ``max_pages`` and ``tiles``.
+    """
+    with open(path, "r") as f:
+        return [CrawlJob.from_dict(entry) for entry in json.load(f)]
@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import setup_logger
+from typing import Any, Callable, Dict, List, Optional
+
+# Setup logger
+logger = setup_logger()
+
+Bounds = Dict[str, float]
+
+
+def split_bounds(bounds: Bounds) -> List[Bounds]:
+    """Split a mapBounds box into four quadrants."""
+    north, south = bounds["north"], bounds["south"]
+    east, west = bounds["east"], bounds["west"]
+    mid_lat = (north + south) / 2
+    mid_lng = (east + west) / 2
+    return [
+        {"north": north, "south": mid_lat, "east": mid_lng, "west": west},
+        {"north": north, "south": mid_lat, "east": east, "west": mid_lng},
+        {"north": mid_lat, "south": south, "east": mid_lng, "west": west},
+        {"north": mid_lat, "south": south, "east": east, "west": mid_lng},
+    ]
+
+
+def tile_payload(template: Dict[str, Any], bounds: Bounds) -> Dict[str, Any]:
+    """Copy of a search payload restricted to ``bounds``."""
+    payload = dict(template)
+    state = dict(template["searchQueryState"])
+    state["mapBounds"] = dict(bounds)
+    payload["searchQueryState"] = state
+    return payload
+
+
+def count_payload(template: Dict[str, Any], bounds: Bounds) -> Dict[str, Any]:
+    """Payload that only asks for the result total (cat2) inside ``bounds``."""
+    payload = tile_payload(template, bounds)
+    payload["wants"] = {"cat2": ["total"]}
+    return payload
+
+
+def extract_total(data: Dict[str, Any]) -> Optional[int]:
+    """Result count from a search response, wherever the API reported it."""
+    candidates = (
+        data.get("categoryTotals", {}).get("cat2", {}).get("totalResultCount"),
+        data.get("cat2", {}).get("searchList", {}).get("totalResultCount"),
+        data.get("cat1", {}).get("searchList", {}).get("totalResultCount"),
+    )
+    for total in candidates:
+        if total is not None:
+            return int(total)
+    return None
+
+
+class TilePlanner:
+    """Split a search box until every tile's result count fits under the page cap.
+
+    ``count(bounds)`` returns the number of results inside a box, or ``None``
+    if the count failed. Boxes are split into quadrants level by level,
+    counting ``workers`` boxes at a time in parallel, until they fit
+    ``max_results`` or reach ``max_depth``. A box whose count is unknown is
+    kept as a tile rather than split, and after ``max_failed_counts``
+    failures no more counts are sent: every remaining box becomes a tile.
+    Boxes also stop splitting once the plan would exceed ``max_tiles``.
+    """
+
+    def __init__(
+        self,
+        count: Callable[[Bounds], Optional[int]],
+        max_results: int = 800,
+        max_depth: int = 8,
+        workers: int = 4,
+        max_tiles: int = 256,
+        max_failed_counts: int = 3,
+    ):
+        self.count = count
+        self.max_results = max_results
+        self.max_depth = max_depth
+        self.workers = workers
+        self.max_tiles = max_tiles
+        self.max_failed_counts = max_failed_counts
+
+    def plan(self, bounds: Bounds) -> List[Dict[str, Any]]:
+        """Return tiles as ``{"bounds", "total", "depth"}`` dicts.
+
+        ``total`` is ``None`` for tiles whose count is unknown.
+        """
+        tiles = []
+        failed = 0
+        level = [bounds]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for depth in range(self.max_depth + 1):
+                if not level:
+                    break
+                next_level = []
+                for start in range(0, len(level), self.workers):
+                    batch = level[start : start + self.workers]
+                    if failed >= self.max_failed_counts:
+                        # Counting is failing; don't add load while it is down
+                        tiles.extend(
+                            {"bounds": box, "total": None, "depth": depth}
+                            for box in batch
+                        )
+                        continue
+                    for box, total in zip(batch, executor.map(self.count, batch)):
+                        if total == 0:
+                            continue
+                        if total is None:
+                            failed += 1
+                        # Room for this box's four quadrants besides all others
+                        room = (
+                            len(tiles) + len(next_level) + len(level) - start + 3
+                            <= self.max_tiles
+                        )
+                        if (
+                            total is None
+                            or total <= self.max_results
+                            or depth == self.max_depth
+                            or not room
+                        ):
+                            tiles.append(
+                                {"bounds": box, "total": total, "depth": depth}
+                            )
+                        else:
+                            next_level.extend(split_bounds(box))
+                level = next_level
+
+        if failed >= self.max_failed_counts:
+            logger.error(f"{failed} tile counts failed; stopped counting early")
+        elif failed:
+            logger.warning(f"{failed} tile counts failed; kept those boxes unsplit")
+        over = [t for t in tiles if t["total"] and t["total"] > self.max_results]
+        if over:
+            logger.warning(f"{len(over)} tiles exceed {self.max_results} results")
+        logger.info(
+            f"Planned {len(tiles)} tiles covering "
+            f"{sum(tile['total'] or 0 for tile in tiles)} results"
+        )
+        return tiles
@@ -1,30 +1,107 @@
 import os
 import json
-import time
+import asyncio
+import argparse
+import threading
+import multiprocessing
 import requests
-from typing import List, Dict, Any, Optional
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 from utils.parser import Parser
+from utils.parse_pool import ParsePool, parse_chunk
 from utils.logger import setup_logger
+from utils.metrics import (
+    FileExporter,
+    PrometheusExporter,
+    SpanTracer,
+    get_metrics,
+)
+from utils.archive import ResponseArchive, iter_archive, list_segments
+from utils.json_stream import iter_items, loads
+from utils.async_fetcher import AsyncFetchEngine
+from utils.rate_limiter import AdaptiveRateLimiter
+from utils.http_client import HttpClient
+from utils.payload_registry import PayloadRegistry, get_registry
+from utils.tiling import TilePlanner, count_payload, extract_total, tile_payload
+from utils.scheduler import (
+    BudgetExhausted,
+    CrawlJob,
+    RequestBudget,
+    Scheduler,
+    load_jobs,
+)
+from utils.retry import FetchError, RetryableFetchError, RetryPolicy, check_status
 
 
+from db.pool import get_pool
+from db.broker_cache import BrokerCache
+from db.ingestion import PageIngestor, new_summary
+from db.bulk_loader import CopyLoader
 from db.repositories.house_repo import HouseRepository
 from db.repositories.broker_repo import BrokerRepository
 from db.repositories.address_repo import AddressRepository
 from db.repositories.images_repo import ImagesRepository
+from db.repositories.history_repo import HouseHistoryRepository
+from db.repositories.checkpoint_repo import (
+    CheckpointRepository,
+    CrawlCursor,
+    SqliteCheckpointRepository,
+)
 
 
 # Setup logger
 logger = setup_logger()
 
-house_repo = HouseRepository()
-broker_repo = BrokerRepository()
-address_repo = AddressRepository()
-image_repo = ImagesRepository()
+# One connection pool shared by every repository
+db_pool = get_pool()
+
+house_repo = HouseRepository(pool=db_pool)
+# Broker name -> id lookups are answered from memory once warmed
+broker_repo = BrokerRepository(pool=db_pool, cache=BrokerCache())
+address_repo = AddressRepository(pool=db_pool)
+image_repo = ImagesRepository(pool=db_pool)
+history_repo = HouseHistoryRepository(pool=db_pool)
 
 parser = Parser()
 
 
+# Transport failures worth retrying, including a body cut off mid-read; any
+# other requests error (e.g. an invalid URL) fails the request fast
+RETRYABLE_REQUEST_ERRORS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+
+
+def request_error(e: requests.RequestException) -> FetchError:
+    """The fetch error a requests exception maps to."""
+    message = f"{type(e).__name__}: {str(e)}"
+    if isinstance(e, RETRYABLE_REQUEST_ERRORS):
+        return RetryableFetchError(message)
+    return FetchError(message)
+
+
+class StreamedListings(list):
+    """A page's listings plus ``parsed``, parsed one by one as they streamed in.
+
+    Filtering makes a plain list, which drops ``parsed``, so it never goes
+    out of line with the listings.
+    """
+
+    def __init__(self, houses: List[Dict[str, Any]], parsed: List[Any]):
+        super().__init__(houses)
+        self.parsed = parsed
+
+
+def list_results(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The listings of a search response."""
+    return data.get("cat1", {}).get("searchResults", {}).get("listResults", [])
+
+
 class ZillowScraper:
 
     URL = "https://www.zillow.com/async-create-search-page-state"
@@ -35,82 +112,618 @@ class ZillowScraper:
         "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
         # Add any required cookies here
     }
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    payload_path = os.path.join(current_dir, "utils", "payloads", "california.json")
 
-    def __init__(self):
+    def __init__(
+        self,
+        batch_ingest: bool = True,
+        url: str = URL,
+        rate: float = 0.5,
+        max_attempts: int = 5,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        pool_maxsize: int = 10,
+        region: str = "california",
+        payloads: Optional[PayloadRegistry] = None,
+        checkpoints=None,
+        resume: bool = False,
+        parse_workers: int = 0,
+        deterministic_ids: bool = False,
+        upsert: bool = False,
+        history: bool = False,
+        archive: Optional[ResponseArchive] = None,
+        stream_json: bool = False,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        budget: Optional[RequestBudget] = None,
+    ):
+        self.url = url
+        # Search payload templates are loaded once per region, not per page
+        self.region = region
+        self.payloads = payloads or get_registry()
+        # One keep-alive session (and cookie jar) reused for every page
+        self.http = HttpClient(
+            headers=self.headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            pool_maxsize=pool_maxsize,
+        )
+        # Request pacing adapts to 429/503 responses; transient errors are retried.
+        # Scheduled jobs pass one shared limiter and budget so they pace together
+        self.limiter = limiter or AdaptiveRateLimiter(rate)
+        self.budget = budget
+        self.retry_policy = RetryPolicy(max_attempts=max_attempts, limiter=self.limiter)
         self.broker_data = []
+        # Serializes the DB stage when several tiles are crawled in parallel
+        self._handle_lock = threading.Lock()
+        self._seen_zpids = set()
+        self._seen_lock = threading.Lock()
+        # Durable per region/tile progress; with resume, committed pages are skipped
+        self.checkpoints = checkpoints
+        self.resume = resume
+        # Raw page responses are kept here when set, for replay without refetching
+        self.archive = archive
+        # Decode only listResults, item by item, while the body downloads
+        self.stream_json = stream_json
+        self._cursors: Dict[str, CrawlCursor] = {}
+        self._cursor_lock = threading.Lock()
+        # Write each page in one transaction instead of row by row
+        self.batch_ingest = batch_ingest
+        # UUIDv5 ids make re-crawls no-op upserts instead of duplicate rows
+        self.deterministic_ids = deterministic_ids
+        self.parser = Parser(deterministic_ids=deterministic_ids)
+        self.ingestor = PageIngestor(
+            house_repo,
+            address_repo,
+            image_repo,
+            pool=db_pool,
+            link_existing=deterministic_ids,
+            # History compares against house rows, so it needs them kept fresh
+            upsert=upsert or history,
+            history=history_repo if history else None,
+        )
+        # Optional process pool for CPU-bound listing parsing
+        self.parse_pool = None
+        if parse_workers > 0:
+            self.parse_pool = ParsePool(
+                parse_workers, deterministic_ids=deterministic_ids
+            )
         logger.info("ZillowScraper initialized")
 
     def scrape(self, max_pages: int = 20):
         logger.info(f"Starting scraping process for {max_pages} pages")
+        self.crawl_region(self.region, max_pages)
+        logger.info(f"Fetch stats: {self.fetch_stats()}")
+
+    def crawl_region(self, region: str, max_pages: int, dedupe: bool = False) -> None:
+        """Fetch and persist the pages of one region payload sequentially.
 
+        The region is only marked completed once an empty page showed the
+        results ran out; stopping at ``max_pages`` leaves it resumable.
+        """
+        cursor = self.crawl_cursor(region)
+        if cursor.completed:
+            logger.info(f"Skipping {region}, already completed")
+            return
+
+        failed_pages = 0
+        exhausted = False
         for page in range(1, max_pages + 1):
+            if cursor.is_done(page):
+                continue
 
-            logger.info(f"Scraping page {page}")
-            houses_data = self.fetch_page(page)
+            # Rate limiting, being nice to Zillow's servers
+            self.limiter.acquire()
+
+            logger.info(f"Scraping {region} page {page}")
+            try:
+                houses_data = self.fetch_page(page, region)
+            except BudgetExhausted:
+                logger.warning(f"Request budget exhausted, stopping {region}")
+                failed_pages += 1
+                break
+            except FetchError as e:
+                logger.error(f"Skipping page {page} after fetch failure: {str(e)}")
+                failed_pages += 1
+                continue
             if not houses_data:
                 logger.warning(f"No data found on page {page}, stopping...")
+                exhausted = True
                 break
 
+            if dedupe:
+                houses_data = self.drop_seen(houses_data)
+                if not houses_data:
+                    self.save_checkpoint(region, page)
+                    continue
+            with self._handle_lock:
+                if not self.handle_page(page, houses_data, region):
+                    failed_pages += 1
+
+        if exhausted and not failed_pages:
+            self.save_checkpoint(region, completed=True)
+
+    def crawl_cursor(self, region: str) -> CrawlCursor:
+        """In-memory progress for a crawl key, loaded from its checkpoint on resume."""
+        with self._cursor_lock:
+            cursor = self._cursors.get(region)
+            if cursor is None:
+                saved = None
+                if self.checkpoints is not None and self.resume:
+                    saved = self.checkpoints.load(region)
+                if saved:
+                    cursor = CrawlCursor(
+                        saved["last_page"], saved["pending"], saved["completed"]
+                    )
+                    logger.info(
+                        f"Resuming {region} after page {cursor.last_page}"
+                        + (" (completed)" if cursor.completed else "")
+                    )
+                else:
+                    cursor = CrawlCursor()
+                self._cursors[region] = cursor
+            return cursor
+
+    def save_checkpoint(
+        self, region: str, page: Optional[int] = None, completed: bool = False, cur=None
+    ) -> None:
+        """Record ``page`` (and/or completion) for a crawl key.
+
+        With ``cur`` the checkpoint joins the caller's transaction and the
+        in-memory cursor is left for the caller to advance after commit.
+        """
+        cursor = self.crawl_cursor(region)
+        with self._cursor_lock:
+            if page is None:
+                last_page, pending = cursor.last_page, sorted(cursor.pending)
+            else:
+                last_page, pending = cursor.with_page(page)
+            if cur is None:
+                if page is not None:
+                    cursor.commit(page)
+                cursor.completed = cursor.completed or completed
+        if self.checkpoints is not None:
+            self.checkpoints.save(region, last_page, pending, completed, cur=cur)
+
+    def scrape_tiles(
+        self,
+        max_pages: int = 20,
+        workers: int = 4,
+        page_size: int = 40,
+        max_tiles: int = 256,
+    ) -> int:
+        """Cover the whole region by crawling tiles that each fit under the page cap.
+
+        The region's mapBounds is split until every tile has at most
+        ``max_pages * page_size`` results; tiles are crawled in parallel and
+        listings seen in an earlier (overlapping) tile are dropped. Boxes whose
+        count fails are crawled unsplit, and at most ``max_tiles`` are planned.
+        """
+        template = self.payloads.template(self.region)
+        planner = TilePlanner(
+            self.count_results,
+            max_results=max_pages * page_size,
+            workers=workers,
+            max_tiles=max_tiles,
+        )
+        tiles = planner.plan(template["searchQueryState"]["mapBounds"])
+
+        names = []
+        for tile in tiles:
+            bounds = tile["bounds"]
+            name = (
+                f"{self.region}:{bounds['north']:.5f},{bounds['west']:.5f},"
+                f"{bounds['south']:.5f},{bounds['east']:.5f}"
+            )
+            self.payloads.register(name, tile_payload(template, bounds))
+            names.append(name)
+
+        logger.info(f"Crawling {len(names)} tiles with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    lambda name: self.crawl_region(name, max_pages, dedupe=True), names
+                )
+            )
+        logger.info(f"Fetch stats: {self.fetch_stats()}")
+        return len(names)
+
+    def count_results(self, bounds: Dict[str, float]) -> Optional[int]:
+        """Number of results the search reports inside ``bounds``."""
+        payload = count_payload(self.payloads.template(self.region), bounds)
+        self.limiter.acquire()
+        try:
+            data = self.retry_policy.call(self.request_json, payload)
+        except FetchError as e:
+            logger.error(f"Error counting results for {bounds}: {str(e)}")
+            return None
+        return extract_total(data)
+
+    def drop_seen(self, houses_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove listings already handled by another tile."""
+        fresh = []
+        with self._seen_lock:
+            for house in houses_data:
+                zpid = house.get("zpid") or house.get("id")
+                if zpid is None:
+                    fresh.append(house)
+                elif zpid not in self._seen_zpids:
+                    self._seen_zpids.add(zpid)
+                    fresh.append(house)
+        return fresh
+
+    def scrape_async(
+        self,
+        max_pages: int = 20,
+        concurrency: int = 4,
+        rate: Optional[float] = None,
+        queue_size: int = 8,
+    ) -> int:
+        """Fetch pages concurrently, paced by the rate limiter instead of a fixed sleep."""
+        logger.info(
+            f"Starting async scraping process for {max_pages} pages "
+            f"(concurrency={concurrency})"
+        )
+        if rate is not None:
+            self.limiter.rate = rate
+        cursor = self.crawl_cursor(self.region)
+        if cursor.completed:
+            logger.info(f"Skipping {self.region}, already completed")
+            return 0
+        engine = AsyncFetchEngine(
+            concurrency=concurrency, queue_size=queue_size, limiter=self.limiter
+        )
+        failed_pages = []
+
+        def handle(page: int, houses_data: List[Dict[str, Any]]) -> None:
+            if not self.handle_page(page, houses_data):
+                failed_pages.append(page)
+
+        pages = [page for page in range(1, max_pages + 1) if not cursor.is_done(page)]
+        handled = asyncio.run(engine.run(pages, self.fetch_page, handle))
+        # Same rule as crawl_region: complete only when the results ran out
+        if engine.exhausted and not engine.failed and not failed_pages:
+            self.save_checkpoint(self.region, completed=True)
+        logger.info(f"Fetch stats: {self.fetch_stats()}")
+        return handled
+
+    def fetch_stats(self) -> Dict[str, Any]:
+        """Retry counters plus the limiter's current rate and throttle events."""
+        stats = self.retry_policy.stats()
+        stats["rate"] = self.limiter.rate
+        stats["throttle_events"] = self.limiter.throttle_events
+        stats["latency"] = self.http.latency_stats()
+        stats["broker_cache"] = broker_repo.cache.stats()
+        return stats
+
+    def close(self) -> None:
+        self.http.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+
+    def handle_page(
+        self,
+        page: int,
+        houses_data: List[Dict[str, Any]],
+        region: Optional[str] = None,
+        parsed: Optional[List[Any]] = None,
+    ) -> bool:
+        """Persist the brokers and houses of one fetched page, then checkpoint it.
+
+        ``parsed`` is the page already parsed (ahead of time on the parse pool,
+        or while it streamed in); it is taken from ``houses_data`` when that is
+        a StreamedListings. Returns False when the page's transaction failed and was not
+        checkpointed.
+        """
+        region = region or self.region
+        if parsed is None:
+            parsed = getattr(houses_data, "parsed", None)
+        with get_metrics().span("brokers", listings=len(houses_data)):
             self.process_broker_data(houses_data)
-            self.process_houses_data(houses_data)
+        if self.batch_ingest:
+            checkpoint = None
+            if self.checkpoints is not None and self.checkpoints.transactional:
+                # Written in the page transaction so resume never loses or repeats rows
+                def checkpoint(cur):
+                    self.save_checkpoint(region, page, cur=cur)
 
-            # insert data
-            parser.reset_data(self.broker_data)
+            summary = self.process_houses_batch(houses_data, checkpoint, parsed)
+            logger.info(f"Page {page} summary: {summary}")
+            if summary["committed"]:
+                if checkpoint is None:
+                    self.save_checkpoint(region, page)
+                else:
+                    cursor = self.crawl_cursor(region)
+                    with self._cursor_lock:
+                        cursor.commit(page)
+        else:
+            self.process_houses_data(houses_data)
+            self.save_checkpoint(region, page)
 
-            # Rate limiting
-            time.sleep(2)  # Being nice to Zillow's servers
+        # insert data
+        parser.reset_data(self.broker_data)
+        return not self.batch_ingest or summary["committed"]
 
     def get_query_body(self, page: int) -> Dict[str, Any]:
-        with open(self.payload_path, "r") as f:
-            payload = json.load(f)
-
         # Set the page number you wanna extract
-        payload["searchQueryState"]["pagination"]["currentPage"] = page
-        return payload
+        return self.payloads.body(self.region, page)
+
+    def fetch_page(
+        self, page: int, region: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch the listings of one page, retrying transient errors.
 
-    def fetch_page(self, page: int) -> List[Dict[str, Any]]:
+        Raises FetchError when the page could not be fetched, so callers can
+        tell a failed page apart from an empty one.
+        """
+        region = region or self.region
+        metrics = get_metrics()
         try:
-            response = requests.put(
-                url=self.URL, json=self.get_query_body(page), headers=self.headers
-            )
-            data = response.json()
+            with metrics.span("fetch", region=region, page=page):
+                houses = self.retry_policy.call(self.request_page, page, region)
+        except FetchError as e:
+            metrics.inc("pages_total", help="Fetched pages", outcome="failed")
+            logger.error(f"Error fetching page {page}: {str(e)}")
+            raise
+        metrics.inc("pages_total", help="Fetched pages", outcome="fetched")
+        metrics.inc("listings_fetched_total", len(houses), "Listings in fetched pages")
+        logger.info(f"Fetched {len(houses)} houses from page {page}")
+        return houses
+
+    def request_page(self, page: int, region: str) -> List[Dict[str, Any]]:
+        """Send a single search request for one page of a region."""
+        body = self.payloads.serialized(region, page)
+        if self.stream_json:
+            return self.request_listings(body, archive_as=(region, page))
+        data = self.request_json(body, archive_as=(region, page))
+
+        # Get the houses data from the response
+        return list_results(data)
+
+    def spend_request(self) -> None:
+        """Charge one request, retries included, to the shared budget."""
+        if self.budget is not None and not self.budget.spend():
+            raise BudgetExhausted("Request budget exhausted")
+
+    def request_listings(
+        self, body: bytes, archive_as: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Like ``request_json``, but decode only the listResults items.
+
+        Items are decoded as their bytes arrive, and mapResults and the other
+        unused subtrees are skipped without being built as objects. Without a
+        parse pool each item is also parsed as soon as it is decoded, so the
+        page is parsed by the time its download ends (see StreamedListings).
+        """
+        self.spend_request()
+        try:
+            response, chunks = self.http.stream_put(self.url, data=body)
+        except requests.RequestException as e:
+            raise request_error(e) from e
+
+        try:
+            check_status(response.status_code, response.headers)
+        except FetchError:
+            try:
+                for _ in chunks:  # release the connection
+                    pass
+            except requests.RequestException:
+                pass  # the error body was cut off; report the status
+            raise
+
+        kept: List[bytes] = []
+        if archive_as is not None and self.archive is not None:
+            # Keep the raw body for the archive while it streams past
+            chunks = (kept.append(chunk) or chunk for chunk in chunks)
+        houses: List[Dict[str, Any]] = []
+        parsed: List[Any] = []
+        parse = self.parse_pool is None and self.batch_ingest
+        try:
+            for house in iter_items(chunks):
+                houses.append(house)
+                if parse:
+                    parsed.extend(parse_chunk([house], self.deterministic_ids))
+        except requests.RequestException as e:
+            raise request_error(e) from e
+        except ValueError as e:
+            raise RetryableFetchError(f"Invalid JSON response: {str(e)}") from e
+        if kept:
+            self.archive.append(*archive_as, b"".join(kept))
+        return StreamedListings(houses, parsed) if parse else houses
+
+    def request_json(
+        self, body, archive_as: Optional[Tuple[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Send one search request and classify its failure modes.
 
-            # Get the houses data from the response
-            houses = (
-                data.get("cat1", {}).get("searchResults", {}).get("listResults", [])
+        With ``archive_as`` (region, page) the raw body of a successful
+        response is also written to the archive, if one is configured.
+        """
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.spend_request()
+        try:
+            # The body is read here too, so a truncated one fails this call
+            response = self.http.put(self.url, data=body)
+        except requests.RequestException as e:
+            raise request_error(e) from e
+
+        check_status(response.status_code, response.headers)
+        try:
+            data = loads(response.content)
+        except ValueError as e:
+            raise RetryableFetchError(f"Invalid JSON response: {str(e)}") from e
+        if archive_as is not None and self.archive is not None:
+            self.archive.append(*archive_as, response.content)
+        return data
+
+    def replay(self, paths: Iterable[str]) -> Dict[str, int]:
+        """Persist archived responses as if they had just been fetched.
+
+        ``paths`` are archive directories or segment files. Nothing is sent
+        over the network and the rate limiter is not used. Pages are
+        checkpointed like fetched ones, so replay with a scraper that has no
+        checkpoints unless that is wanted. With a parse pool, the next pages
+        parse on the pool while the current one is written.
+        """
+        counts = {"pages": 0, "listings": 0, "failed_pages": 0}
+        metrics = get_metrics()
+        for (region, page, houses_data), parsed in self.archived_pages(paths):
+            metrics.inc("pages_total", help="Fetched pages", outcome="replayed")
+            counts["pages"] += 1
+            counts["listings"] += len(houses_data)
+            with self._handle_lock:
+                if not self.handle_page(page, houses_data, region, parsed):
+                    counts["failed_pages"] += 1
+        logger.info(f"Replayed {counts}")
+        return counts
+
+    def replay_copy(
+        self, paths: Iterable[str], loader: Optional[CopyLoader] = None
+    ) -> Dict[str, Any]:
+        """Backfill archived responses with COPY instead of page transactions.
+
+        Parsed rows are gathered until ``loader.chunk_rows`` houses, then
+        loaded in one COPY transaction. Pages are not checkpointed, and rows
+        that already exist are skipped rather than upserted.
+        """
+        loader = loader or CopyLoader(pool=db_pool)
+        counts: Dict[str, Any] = {"pages": 0, "listings": 0}
+        tables = {
+            table: {"staged": 0, "merged": 0, "seconds": 0.0}
+            for table in ("house", "address", "images")
+        }
+        houses: List[tuple] = []
+        addresses: List[tuple] = []
+        images: List[tuple] = []
+
+        def flush() -> None:
+            report = loader.load(houses, addresses, images)
+            for table, stats in report.items():
+                for key in tables[table]:
+                    tables[table][key] += stats[key]
+            for rows in (houses, addresses, images):
+                rows.clear()
+
+        for (_, _, houses_data), parsed in self.archived_pages(paths):
+            counts["pages"] += 1
+            counts["listings"] += len(houses_data)
+            self.process_broker_data(houses_data)
+            parser.reset_data(self.broker_data)
+            if parsed is None:
+                parsed = parse_chunk(houses_data, self.deterministic_ids)
+            page_houses, page_addresses, page_images, _ = self.resolve_parsed(parsed)
+            houses.extend(page_houses)
+            addresses.extend(page_addresses)
+            images.extend(page_images)
+            if len(houses) >= loader.chunk_rows:
+                flush()
+        if houses:
+            flush()
+
+        for table, stats in tables.items():
+            seconds = stats["seconds"]
+            stats["rows_per_sec"] = stats["staged"] / seconds if seconds > 0 else 0.0
+            logger.info(
+                f"COPY replay {table}: {stats['merged']}/{stats['staged']} rows "
+                f"({stats['rows_per_sec']:.0f} rows/sec)"
             )
-            logger.info(f"Fetched {len(houses)} houses from page {page}")
+        counts["tables"] = tables
+        logger.info(f"Replayed {counts['pages']} pages with COPY")
+        return counts
 
-            return houses
-        except Exception as e:
-            logger.error(f"Error fetching page {page}: {str(e)}", exc_info=True)
-            return []
+    def archived_pages(self, paths: Iterable[str]) -> Iterator[Tuple[tuple, Any]]:
+        """Yield ``((region, page, listings), parsed)`` for archived pages.
 
-    def process_broker_data(self, houses_data: List[Dict[str, Any]]) -> List[tuple]:
+        With a parse pool the pages are parsed ahead, so the next ones parse
+        while the caller writes the current one; otherwise ``parsed`` is None.
+        """
+        records = (
+            (record["region"], record["page"], list_results(record["response"]))
+            for record in iter_archive(paths)
+        )
+        pages = ((record, record[2]) for record in records if record[2])
+        if self.batch_ingest and self.parse_pool is not None:
+            return self.parse_pool.parse_pages(pages)
+        return ((record, None) for record, _ in pages)
+
+    def process_broker_data(
+        self, houses_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         for house in houses_data:
             brokerName = house.get("brokerName")
             if brokerName:
                 self.broker_data.append(brokerName)
 
-        self.insert_broker_data()
+        return self.insert_broker_data()
 
-    def insert_broker_data(self):
+    def insert_broker_data(self) -> List[Dict[str, Any]]:
         try:
             if self.broker_data:
-                broker_repo.bulk_create(self.broker_data)
+                brokers = broker_repo.bulk_create(self.broker_data)
                 logger.info(f"Successfully processed {len(self.broker_data)} brokers")
+                return brokers
             else:
                 logger.warning("No broker data to insert")
         except Exception as e:
             logger.error(f"Error inserting broker data: {str(e)}", exc_info=True)
+        return []
+
+    def process_houses_batch(
+        self,
+        houses_data: List[Dict[str, Any]],
+        checkpoint=None,
+        parsed: Optional[List[Any]] = None,
+    ) -> Dict[str, Any]:
+        """Parse a whole page, unless given ``parsed``, then write it in one batch."""
+        metrics = get_metrics()
+        if parsed is None:
+            with metrics.span("parse", listings=len(houses_data)):
+                if self.parse_pool is not None:
+                    parsed = self.parse_pool.parse_page(houses_data)
+                else:
+                    parsed = parse_chunk(houses_data, self.deterministic_ids)
+        failed = parsed.count(None)
+        metrics.inc("listings_parsed_total", len(parsed) - failed, "Parsed listings")
+        metrics.inc("listings_failed_total", failed, "Listings that failed to parse")
+        with metrics.span("persist", listings=len(parsed)):
+            return self.ingest_parsed(parsed, checkpoint)
+
+    def resolve_parsed(self, parsed: List[Any]) -> Tuple[list, list, list, int]:
+        """House rows with broker ids, address and image rows, parse failures."""
+        houses, addresses, images = [], [], []
+        parse_failures = 0
+
+        for listing in parsed:
+            if listing is None:
+                parse_failures += 1
+                continue
+            house_row, broker_name, address_row, image_rows = listing
+
+            # Brokers were just upserted, so this is a cache hit
+            broker = broker_repo.get_by_name(broker_name) if broker_name else None
+            houses.append(house_row + (broker.get("id") if broker else None,))
+            if address_row:
+                addresses.append(address_row)
+            images.extend(image_rows)
+        return houses, addresses, images, parse_failures
+
+    def ingest_parsed(self, parsed: List[Any], checkpoint=None) -> Dict[str, Any]:
+        """Resolve brokers for parsed listings and write them as one batch."""
+        houses, addresses, images, parse_failures = self.resolve_parsed(parsed)
+
+        if houses or checkpoint is not None:
+            summary = self.ingestor.ingest(houses, addresses, images, checkpoint)
+        else:
+            # Nothing to write, but the page is still done
+            summary = new_summary()
+            summary["committed"] = True
+        summary["house"]["failed"] += parse_failures
+        return summary
 
     def process_houses_data(self, houses_data: List[Dict[str, Any]]) -> None:
         for house in houses_data:
             try:
                 # Parse the house data
-                house_data = parser.parse_house_data(house)
+                house_data = self.parser.parse_house_data(house)
                 if not house_data:
                     logger.warning("Failed to parse house data")
                     continue
@@ -136,7 +749,7 @@ class ZillowScraper:
                     continue
 
                 # Process address data and continue if None
-                address_data = parser.parse_address_data(house, house_data[0])
+                address_data = self.parser.parse_address_data(house, house_data[0])
                 if not address_data:
                     logger.warning(f"No address data for house {house_data[0]}")
                     continue
@@ -151,7 +764,7 @@ class ZillowScraper:
                     )
 
                 # Process image data and continue if None
-                image_data = parser.parse_image_data(
+                image_data = self.parser.parse_image_data(
                     house, house_data[0]
                 )  # Use house UUID (id)
                 if not image_data:
@@ -175,13 +788,252 @@ class ZillowScraper:
                 continue
 
 
+def replay_segment(path: str, options: Dict[str, Any]) -> Dict[str, int]:
+    """Replay one archive segment with its own scraper (a worker process)."""
+    broker_repo.warm_cache()
+    scraper = ZillowScraper(**options)
+    try:
+        return scraper.replay([path])
+    finally:
+        scraper.close()
+
+
+def replay_parallel(
+    paths: Iterable[str], workers: int, options: Dict[str, Any]
+) -> Dict[str, int]:
+    """Replay archive segments on ``workers`` processes, one segment per task.
+
+    Pages from different segments are written in no particular order, so
+    use upserts (or deterministic ids) when segments overlap.
+    """
+    segments = []
+    for path in paths:
+        segments.extend(list_segments(path) if os.path.isdir(path) else [path])
+    totals = {"pages": 0, "listings": 0, "failed_pages": 0}
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for counts in executor.map(replay_segment, segments, repeat(options)):
+            for key, value in counts.items():
+                totals[key] += value
+    logger.info(f"Replayed {len(segments)} segments: {totals}")
+    return totals
+
+
+def run_scheduled_job(
+    job: CrawlJob,
+    args: argparse.Namespace,
+    checkpoints,
+    archive: Optional[ResponseArchive] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    budget: Optional[RequestBudget] = None,
+) -> int:
+    """Crawl one scheduled job with its own scraper; returns requests sent.
+
+    ``limiter`` and ``budget`` are shared by all jobs, so concurrent jobs
+    are paced and capped together rather than each on its own.
+    """
+    scraper = ZillowScraper(
+        url=args.url,
+        rate=args.rate,
+        region=job.region,
+        checkpoints=checkpoints,
+        deterministic_ids=args.deterministic_ids,
+        upsert=args.upsert,
+        history=args.history,
+        archive=archive,
+        stream_json=args.stream_json,
+        limiter=limiter,
+        budget=budget,
+    )
+    try:
+        if job.tiles:
+            scraper.scrape_tiles(job.max_pages, workers=args.concurrency)
+        else:
+            scraper.scrape(job.max_pages)
+        return scraper.retry_policy.stats()["attempts"]
+    finally:
+        scraper.close()
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description="Zillow listings scraper")
+    arg_parser.add_argument("--pages", type=int, default=20)
+    arg_parser.add_argument("--url", default=ZillowScraper.URL)
+    arg_parser.add_argument(
+        "--region", default="california", help="payload name in utils/payloads"
+    )
+    arg_parser.add_argument(
+        "--async-fetch", action="store_true", help="fetch pages concurrently"
+    )
+    arg_parser.add_argument("--concurrency", type=int, default=4)
+    arg_parser.add_argument(
+        "--tiles", action="store_true", help="split the region into map tiles"
+    )
+    arg_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="parse listings on this many processes (0 = in-process)",
+    )
+    arg_parser.add_argument(
+        "--deterministic-ids",
+        action="store_true",
+        help="derive row ids from zpid / image URL so re-crawls are idempotent",
+    )
+    arg_parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="update existing houses whose price/status/details changed",
+    )
+    arg_parser.add_argument(
+        "--history",
+        action="store_true",
+        help="record price/status changes in house_history (implies --upsert)",
+    )
+    arg_parser.add_argument(
+        "--resume", action="store_true", help="skip pages committed by a previous run"
+    )
+    arg_parser.add_argument(
+        "--checkpoint-file",
+        help="keep checkpoints in this SQLite file instead of PostgreSQL",
+    )
+    arg_parser.add_argument(
+        "--schedule", help="JSON file of crawl jobs to run on refresh intervals"
+    )
+    arg_parser.add_argument(
+        "--schedule-state", default="scheduler_state.json", help="scheduler state file"
+    )
+    arg_parser.add_argument(
+        "--request-budget", type=int, help="max requests per hour across all jobs"
+    )
+    arg_parser.add_argument(
+        "--rate", type=float, default=0.5, help="initial pages/second"
+    )
+    arg_parser.add_argument(
+        "--metrics-port", type=int, help="serve Prometheus metrics on this port"
+    )
+    arg_parser.add_argument(
+        "--metrics-file", help="write Prometheus metrics to this file periodically"
+    )
+    arg_parser.add_argument(
+        "--trace-file", help="append per-stage spans as JSON lines to this file"
+    )
+    arg_parser.add_argument(
+        "--stream-json",
+        action="store_true",
+        help="decode and parse listResults items while responses download",
+    )
+    arg_parser.add_argument(
+        "--archive", help="keep raw responses in compressed segments in this directory"
+    )
+    arg_parser.add_argument(
+        "--replay",
+        nargs="+",
+        help="persist archived responses (directories or segments) instead of fetching",
+    )
+    arg_parser.add_argument(
+        "--replay-workers",
+        type=int,
+        default=1,
+        help="replay segments on this many processes",
+    )
+    arg_parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="backfill --replay with COPY into staging tables (insert-only, "
+        "no checkpoints) and report rows/sec",
+    )
+    args = arg_parser.parse_args()
+    if args.copy and (not args.replay or args.replay_workers > 1):
+        arg_parser.error("--copy needs --replay with a single replay worker")
+    if args.copy and (args.upsert or args.history):
+        arg_parser.error("--copy only inserts; it cannot --upsert or keep --history")
+    return args
+
+
 if __name__ == "__main__":
 
-    scraper = ZillowScraper()
+    args = parse_args()
+    if args.checkpoint_file:
+        checkpoints = SqliteCheckpointRepository(args.checkpoint_file)
+    else:
+        checkpoints = CheckpointRepository(pool=db_pool)
+    archive = ResponseArchive(args.archive) if args.archive else None
+    scraper = ZillowScraper(
+        url=args.url,
+        rate=args.rate,
+        region=args.region,
+        # Replayed pages must not mark the live crawl as done
+        checkpoints=None if args.replay else checkpoints,
+        resume=args.resume,
+        parse_workers=args.parse_workers,
+        deterministic_ids=args.deterministic_ids,
+        upsert=args.upsert,
+        history=args.history,
+        archive=archive,
+        stream_json=args.stream_json,
+    )
+    metrics = get_metrics()
+    if args.trace_file:
+        metrics.tracer = SpanTracer(args.trace_file)
+    exporters = []
+    if args.metrics_port:
+        exporters.append(PrometheusExporter(metrics, port=args.metrics_port))
+    if args.metrics_file:
+        exporters.append(FileExporter(metrics, args.metrics_file))
+    for exporter in exporters:
+        exporter.start()
     try:
         logger.info("Starting Zillow scraper")
-        scraper.scrape()
+        broker_repo.warm_cache()
+        checkpoints.ensure_table()
+        if args.history:
+            history_repo.ensure_table()
+        if args.schedule:
+            budget = RequestBudget(args.request_budget) if args.request_budget else None
+            limiter = AdaptiveRateLimiter(args.rate)
+            scheduler = Scheduler(
+                lambda job: run_scheduled_job(
+                    job, args, checkpoints, archive, limiter, budget
+                ),
+                workers=args.concurrency,
+                budget=budget,
+                state_path=args.schedule_state,
+            )
+            for job in load_jobs(args.schedule):
+                scheduler.add(job)
+            scheduler.run()
+        elif args.copy:
+            scraper.replay_copy(args.replay)
+        elif args.replay and args.replay_workers > 1:
+            replay_parallel(
+                args.replay,
+                args.replay_workers,
+                {
+                    "deterministic_ids": args.deterministic_ids,
+                    "upsert": args.upsert,
+                    "history": args.history,
+                },
+            )
+        elif args.replay:
+            scraper.replay(args.replay)
+        elif args.tiles:
+            scraper.scrape_tiles(args.pages, workers=args.concurrency)
+        elif args.async_fetch:
+            scraper.scrape_async(args.pages, concurrency=args.concurrency)
+        else:
+            scraper.scrape(args.pages)
     except Exception as e:
         logger.error(f"Fatal error in main: {str(e)}", exc_info=True)
     finally:
+        scraper.close()
+        if archive is not None:
+            archive.close()
+        logger.info(f"Connection pool stats: {db_pool.stats()}")
+        db_pool.close()
+        for exporter in exporters:
+            exporter.stop()
+        if metrics.tracer is not None:
+            metrics.tracer.close()
         logger.info("Zillow scraper closed")